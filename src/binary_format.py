@@ -0,0 +1,156 @@
+import mmap
+import operator
+import os
+import struct
+import sys
+import tempfile
+from src.compact import CompactAutomaton
+
+MAGIC = b"FAUT"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIIIII")
+_DETERMINISTIC = 1
+_BIG_ENDIAN = 2
+
+
+def save(compact: CompactAutomaton, path: str) -> None:
+    """
+    Writes a compact automaton in the binary format.
+
+    Layout: a little-endian header (magic, version, flags, number of
+    states, start state, number of edges, symbol table size, number of
+    symbols), then sections aligned to 8 bytes: the symbols as
+    NUL-separated UTF-8, int64 state labels, uint32 CSR offsets, uint32
+    edge symbols, uint32 edge targets and the accept bitmap. Arrays are in
+    the native byte order, recorded in the flags.
+
+    The file is written under a temporary name in the same directory and
+    then renamed over path, so processes that mapped the old file with
+    load() keep seeing the old contents. The new file gets the mode of the
+    file it replaces, or the default mode under the current umask.
+    """
+    symbol_table = b"\0".join(symbol.encode("utf-8") for symbol in compact.symbols)
+    flags = _DETERMINISTIC if compact.deterministic else 0
+    if sys.byteorder == "big":
+        flags |= _BIG_ENDIAN
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        flags,
+        compact.num_states,
+        compact.start_state,
+        len(compact.edge_targets),
+        len(symbol_table),
+        len(compact.symbols),
+    )
+
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary_path = tempfile.mkstemp(
+        prefix=".automaton-", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            position = 0
+            for section in (
+                header,
+                symbol_table,
+                compact.state_labels,
+                compact.offsets,
+                compact.edge_symbols,
+                compact.edge_targets,
+                compact.accept,
+            ):
+                position += file.write(section)
+                padding = -position % 8
+                position += file.write(b"\0" * padding)
+            file.flush()
+            os.fchmod(file.fileno(), mode)
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+def load(path: str) -> CompactAutomaton:
+    """
+    Maps a file written by save() into memory. The arrays of the returned
+    automaton are memoryviews over the read-only mapping, so nothing is
+    copied and processes loading the same file share its pages. The start
+    state, CSR offsets, edge symbols and edge targets are checked against
+    the header, so a corrupt file fails here rather than during matching.
+    """
+    with open(path, "rb") as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:
+            raise ValueError("Invalid automaton file: empty file") from exc
+    view = memoryview(buffer)
+    if len(view) < _HEADER.size:
+        raise ValueError("Invalid automaton file: truncated header")
+
+    (
+        magic,
+        version,
+        flags,
+        num_states,
+        start_state,
+        num_edges,
+        symbol_table_size,
+        num_symbols,
+    ) = _HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError("Invalid automaton file: bad magic number")
+    if version != VERSION:
+        raise ValueError(f"Unsupported automaton file version: {version}")
+    if bool(flags & _BIG_ENDIAN) != (sys.byteorder == "big"):
+        raise ValueError("Automaton file has a different byte order")
+
+    position = _HEADER.size
+
+    def section(size: int, item_format: str | None = None) -> memoryview:
+        nonlocal position
+        position += -position % 8
+        if position + size > len(view):
+            raise ValueError("Invalid automaton file: truncated section")
+        data = view[position : position + size]
+        position += size
+        return data.cast(item_format) if item_format else data
+
+    symbols = tuple(bytes(section(symbol_table_size)).decode("utf-8").split("\0"))
+    if len(symbols) != num_symbols:
+        raise ValueError("Invalid automaton file: bad symbol table")
+    state_labels = section(8 * num_states, "q")
+    offsets = section(4 * (num_states + 1), "I")
+    edge_symbols = section(4 * num_edges, "I")
+    edge_targets = section(4 * num_edges, "I")
+    accept = section((num_states + 7) // 8)
+
+    if start_state >= num_states:
+        raise ValueError("Invalid automaton file: start state out of range")
+    if offsets[0] != 0 or offsets[num_states] != num_edges:
+        raise ValueError("Invalid automaton file: bad offsets")
+    if not all(map(operator.le, offsets[:-1], offsets[1:])):
+        raise ValueError("Invalid automaton file: bad offsets")
+    if num_edges and (
+        max(edge_targets) >= num_states or max(edge_symbols) >= num_symbols
+    ):
+        raise ValueError("Invalid automaton file: edge out of range")
+
+    return CompactAutomaton(
+        symbols,
+        start_state,
+        state_labels,
+        accept,
+        offsets,
+        edge_symbols,
+        edge_targets,
+        bool(flags & _DETERMINISTIC),
+    )
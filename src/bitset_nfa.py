@@ -0,0 +1,213 @@
+from collections import deque
+from typing import TYPE_CHECKING
+from src.compact import CompactAutomaton
+from src.graph_analysis import epsilon_closures, productive_states
+
+if TYPE_CHECKING:
+    from src.nfa import NFA
+
+
+class BitsetNFA:
+    """
+    Precompiled NFA simulation over int bitmasks.
+
+    Bit i of a mask stands for states[i] and start_state is the mask of the
+    start closure. Epsilon closures are folded into the start mask and into
+    the successor masks, and for every symbol the successors are memoized
+    per byte of the mask, so one input symbol costs one table lookup and OR
+    per non-zero byte of the current state set. Table entries are filled in
+    the first time a byte value occurs. Only non-zero bytes are visited, so
+    a step costs O(active bytes) rather than O(states / 8).
+
+    Whole-mask transitions are memoized too, up to max_cached masks per
+    symbol (the memo is dropped when full), so on inputs that revisit the
+    same state sets a step is a single dict lookup.
+
+    nfa may also be a CompactAutomaton; it is then read straight from its
+    arrays, without the dict-of-dicts form, and bit i stands for compact
+    state i.
+    """
+
+    def __init__(self, nfa: "NFA | CompactAutomaton", max_cached: int = 4096):
+        if isinstance(nfa, CompactAutomaton):
+            self._init_compact(nfa)
+        else:
+            self._init_nfa(nfa)
+
+        self._tables = {
+            symbol: self._byte_tables(successors)
+            for symbol, successors in self.successors.items()
+        }
+        self.max_cached = max_cached
+        self._cache: dict[str, dict[int, int]] = {
+            symbol: {} for symbol in self.alphabet
+        }
+
+    def _init_nfa(self, nfa: "NFA") -> None:
+        self.states = [nfa.start_state, *nfa.states, *nfa.accept_states]
+        for state, transitions in nfa.transitions.items():
+            self.states.append(state)
+            for next_states in transitions.values():
+                self.states.extend(next_states)
+        self.states = list(dict.fromkeys(self.states))
+        self.index = {state: i for i, state in enumerate(self.states)}
+        self.alphabet = nfa.alphabet - {""}
+
+        if nfa._has_epsilon_transitions():
+            epsilon_closure = nfa._compute_epsilon_closure()
+        else:
+            epsilon_closure = {}
+        closure_masks = [
+            self._mask(epsilon_closure.get(state, {state})) for state in self.states
+        ]
+
+        self.start_state = closure_masks[self.index[nfa.start_state]]
+        self.accept_mask = self._mask(nfa.accept_states)
+        self.live_mask = self._mask(
+            productive_states(nfa.accept_states, nfa.transitions)
+        )
+        self.successors: dict[str, list[int]] = {
+            symbol: [0] * len(self.states) for symbol in self.alphabet
+        }
+        for state, transitions in nfa.transitions.items():
+            i = self.index[state]
+            for symbol, next_states in transitions.items():
+                if symbol == "":
+                    continue
+                for next_state in next_states:
+                    self.successors[symbol][i] |= closure_masks[self.index[next_state]]
+
+    def _init_compact(self, compact: CompactAutomaton) -> None:
+        num_states = compact.num_states
+        self.states = compact.state_labels
+        self.alphabet = compact.alphabet
+
+        epsilon_edges = {
+            state: {"": list(compact.successors(state, 0))}
+            for state in range(num_states)
+            if compact.has_epsilon(state)
+        }
+        closure_masks = [1 << state for state in range(num_states)]
+        if epsilon_edges:
+            closures = epsilon_closures(epsilon_edges, epsilon_edges)
+            for state, closure in closures.items():
+                closure_masks[state] = sum(1 << member for member in closure)
+
+        self.start_state = closure_masks[compact.start_state]
+        self.accept_mask = int.from_bytes(compact.accept, "little")
+
+        predecessors: list[list[int]] = [[] for _ in range(num_states)]
+        self.successors = {symbol: [0] * num_states for symbol in self.alphabet}
+        for state in range(num_states):
+            for symbol_id, target in compact.edges(state):
+                predecessors[target].append(state)
+                if symbol_id:
+                    symbol = compact.symbols[symbol_id]
+                    self.successors[symbol][state] |= closure_masks[target]
+
+        productive = bytearray(compact.accept)
+        queue = deque(
+            state for state in range(num_states) if compact.is_accepting(state)
+        )
+        while queue:
+            for previous_state in predecessors[queue.popleft()]:
+                if not productive[previous_state >> 3] >> (previous_state & 7) & 1:
+                    productive[previous_state >> 3] |= 1 << (previous_state & 7)
+                    queue.append(previous_state)
+        self.live_mask = int.from_bytes(productive, "little")
+
+    def _mask(self, states) -> int:
+        mask = 0
+        for state in states:
+            mask |= 1 << self.index[state]
+        return mask
+
+    @staticmethod
+    def _byte_tables(successors: list[int]) -> list[dict[int, int]]:
+        return [{} for _ in range(0, len(successors), 8)]
+
+    def _byte_successors(self, symbol: str, chunk: int, byte: int) -> int:
+        successors = self.successors[symbol]
+        next_mask = 0
+        offset = chunk * 8
+        while byte:
+            low_bit = byte & -byte
+            next_mask |= successors[offset + low_bit.bit_length() - 1]
+            byte ^= low_bit
+        return next_mask
+
+    def step(self, mask: int, symbol: str) -> int:
+        cache = self._cache.get(symbol)
+        if cache is None:
+            return 0
+        next_mask = cache.get(mask)
+        if next_mask is not None:
+            return next_mask
+
+        tables = self._tables[symbol]
+        next_mask = 0
+        rest = mask
+        while rest:
+            chunk = ((rest & -rest).bit_length() - 1) >> 3
+            shift = chunk << 3
+            byte = (rest >> shift) & 0xFF
+            rest ^= byte << shift
+            table = tables[chunk]
+            successors = table.get(byte)
+            if successors is None:
+                successors = table[byte] = self._byte_successors(symbol, chunk, byte)
+            next_mask |= successors
+
+        if len(cache) >= self.max_cached:
+            cache.clear()
+        cache[mask] = next_mask
+        return next_mask
+
+    def successor_masks(self, mask: int, symbols: list[str]) -> list[int]:
+        """
+        step(mask, symbol) for every symbol, bypassing the whole-mask memo.
+
+        Subset construction steps every mask exactly once per symbol, so the
+        memo would only cost time there. The non-zero bytes of mask are found
+        once and shared by all symbols.
+        """
+        data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+        chunks = [(chunk, byte) for chunk, byte in enumerate(data) if byte]
+        result = []
+        for symbol in symbols:
+            tables = self._tables.get(symbol)
+            next_mask = 0
+            if tables is not None:
+                for chunk, byte in chunks:
+                    table = tables[chunk]
+                    successors = table.get(byte)
+                    if successors is None:
+                        successors = table[byte] = self._byte_successors(
+                            symbol, chunk, byte
+                        )
+                    next_mask |= successors
+            result.append(next_mask)
+        return result
+
+    def is_accepting(self, mask: int) -> bool:
+        return bool(mask & self.accept_mask)
+
+    def is_dead(self, mask: int) -> bool:
+        """True when no state of mask can still reach an accept state."""
+        return not mask & self.live_mask
+
+    def simulate(self, input_str: str) -> bool:
+        mask = self.start_state
+        for symbol in input_str:
+            mask = self.step(mask, symbol)
+            if not mask:
+                return False
+        return self.is_accepting(mask)
+
+    def to_states(self, mask: int) -> set[int]:
+        states = set()
+        while mask:
+            low_bit = mask & -mask
+            states.add(self.states[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return states
@@ -0,0 +1,79 @@
+import argparse
+import sys
+from multiprocessing import Pool
+from typing import Iterable, Iterator, NamedTuple
+from src.dfa import DFA
+from src.regex import RegularExpression
+
+
+class CompileResult(NamedTuple):
+    line_number: int
+    regex: str
+    dfa: DFA | None
+    error: str | None
+
+
+def iter_regex_lines(file_path: str) -> Iterator[tuple[int, str]]:
+    """Streams (line number, regex) pairs, blank lines are skipped."""
+    with open(file_path, "r", encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            line = line.strip()
+            if line:
+                yield line_number, line
+
+
+def compile_many(
+    numbered_regexes: Iterable[tuple[int, str]],
+    processes: int | None = None,
+    chunksize: int = 64,
+) -> Iterator[CompileResult]:
+    """
+    Compiles every regex to a minimized DFA on a process pool. Results keep
+    the input order, a regex that fails to compile, with any exception, gets
+    its error message instead of a DFA. processes=1 compiles in the calling
+    process.
+    """
+    if processes == 1:
+        yield from map(_compile_line, numbered_regexes)
+        return
+
+    with Pool(processes) as pool:
+        yield from pool.imap(_compile_line, numbered_regexes, chunksize)
+
+
+def compile_file(
+    file_path: str, processes: int | None = None, chunksize: int = 64
+) -> Iterator[CompileResult]:
+    return compile_many(iter_regex_lines(file_path), processes, chunksize)
+
+
+def _compile_line(numbered_regex: tuple[int, str]) -> CompileResult:
+    line_number, text = numbered_regex
+    try:
+        dfa = DFA.from_regex(RegularExpression(text, read_files=False)).minimize()
+    except Exception as exc:
+        return CompileResult(line_number, text, None, str(exc) or type(exc).__name__)
+    return CompileResult(line_number, text, dfa, None)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compile a file of regular expressions, one per line."
+    )
+    parser.add_argument("file", help="path to the regex file")
+    parser.add_argument("-j", "--processes", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for result in compile_file(args.file, args.processes, args.chunksize):
+        if result.error is None:
+            print(f"{result.line_number}: {len(result.dfa.states)} states")
+        else:
+            failed += 1
+            print(f"{result.line_number}: error: {result.error}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
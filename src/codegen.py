@@ -0,0 +1,79 @@
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable
+from src.graph_analysis import productive_states
+
+if TYPE_CHECKING:
+    from src.dfa import DFA
+
+
+def generate_source(dfa: "DFA") -> str:
+    """
+    Generates Python source of a match(text) function specialized to dfa.
+
+    Every live state becomes one dict that maps a symbol straight to the
+    dict of the next state and the key None to the acceptance flag, so one
+    input symbol costs a single subscript and no state numbers are
+    involved. Transitions into dead states are left out, so match returns
+    as soon as no accepting state is reachable.
+    """
+    live = productive_states(dfa.accept_states, dfa.transitions)
+    states = [dfa.start_state, *dfa.states]
+    for state, transitions in dfa.transitions.items():
+        states.append(state)
+        states.extend(transitions.values())
+    states = list(dict.fromkeys(states))
+    index = {state: i for i, state in enumerate(states)}
+    accept_states = set(dfa.accept_states)
+
+    lines = [f"_rows = [{{}} for _ in range({len(states)})]"]
+    for state in states:
+        entries = [
+            f"{symbol!r}: _rows[{index[next_state]}]"
+            for symbol, next_state in sorted(dfa.transitions.get(state, {}).items())
+            if next_state in live
+        ]
+        entries.append(f"None: {state in accept_states}")
+        lines.append(f"_rows[{index[state]}].update({{{', '.join(entries)}}})")
+    lines += [
+        "",
+        "",
+        f"def match(text, _start=_rows[{index[dfa.start_state]}]):",
+        "    row = _start",
+        "    try:",
+        "        for symbol in text:",
+        "            row = row[symbol]",
+        "    except KeyError:",
+        "        return False",
+        "    return row[None]",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+@lru_cache(maxsize=256)
+def _compile_source(source: str) -> Callable[[str], bool]:
+    namespace: dict = {}
+    exec(compile(source, "<compiled dfa>", "exec"), namespace)
+    return namespace["match"]
+
+
+class CompiledDFA:
+    """
+    DFA matcher compiled from generated source. Pickles as its source, and
+    equal sources share one compiled function through an LRU cache.
+    """
+
+    __slots__ = ("source", "match")
+
+    def __init__(self, source: str):
+        self.source = source
+        self.match = _compile_source(source)
+
+    def __call__(self, text: str) -> bool:
+        return self.match(text)
+
+    def simulate(self, input_str: str) -> bool:
+        return self.match(input_str)
+
+    def __reduce__(self):
+        return (CompiledDFA, (self.source,))
@@ -0,0 +1,178 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterator
+
+
+class CompactAutomaton:
+    """
+    Array-backed automaton in CSR layout.
+
+    States are renumbered 0..num_states-1 (state_labels keeps the original
+    numbers) and symbols are ids into the symbols tuple, id 0 being epsilon.
+    The edges of state s are edge_symbols/edge_targets[offsets[s]:offsets[s + 1]],
+    sorted by symbol id. Acceptance is a bitmap with one bit per state.
+    """
+
+    __slots__ = (
+        "symbols",
+        "symbol_ids",
+        "num_states",
+        "start_state",
+        "state_labels",
+        "accept",
+        "offsets",
+        "edge_symbols",
+        "edge_targets",
+        "deterministic",
+    )
+
+    def __init__(
+        self,
+        symbols: tuple[str, ...],
+        start_state: int,
+        state_labels,
+        accept,
+        offsets,
+        edge_symbols,
+        edge_targets,
+        deterministic: bool,
+    ):
+        self.symbols = symbols
+        self.symbol_ids = {symbol: i for i, symbol in enumerate(symbols)}
+        self.num_states = len(offsets) - 1
+        self.start_state = start_state
+        self.state_labels = state_labels
+        self.accept = accept
+        self.offsets = offsets
+        self.edge_symbols = edge_symbols
+        self.edge_targets = edge_targets
+        self.deterministic = deterministic
+
+    @classmethod
+    def from_automaton(cls, automaton) -> "CompactAutomaton":
+        """Converts an NFA or DFA in dict-of-dicts form."""
+        labels = [automaton.start_state, *automaton.states, *automaton.accept_states]
+        symbols = set(automaton.alphabet)
+        deterministic = True
+        for state, transitions in automaton.transitions.items():
+            labels.append(state)
+            for symbol, next_states in transitions.items():
+                symbols.add(symbol)
+                if isinstance(next_states, int):
+                    labels.append(next_states)
+                else:
+                    deterministic = False
+                    labels.extend(next_states)
+        labels = list(dict.fromkeys(labels))
+        index = {state: i for i, state in enumerate(labels)}
+        symbols.discard("")
+        symbols = ("", *sorted(symbols))
+        symbol_ids = {symbol: i for i, symbol in enumerate(symbols)}
+
+        offsets = array("I", [0])
+        edge_symbols = array("I")
+        edge_targets = array("I")
+        for state in labels:
+            edges = set()
+            for symbol, next_states in automaton.transitions.get(state, {}).items():
+                if isinstance(next_states, int):
+                    next_states = (next_states,)
+                for next_state in next_states:
+                    edges.add((symbol_ids[symbol], index[next_state]))
+            for symbol_id, target in sorted(edges):
+                edge_symbols.append(symbol_id)
+                edge_targets.append(target)
+            offsets.append(len(edge_targets))
+
+        accept = bytearray((len(labels) + 7) // 8)
+        for state in automaton.accept_states:
+            accept[index[state] >> 3] |= 1 << (index[state] & 7)
+
+        return cls(
+            symbols,
+            index[automaton.start_state],
+            array("q", labels),
+            accept,
+            offsets,
+            edge_symbols,
+            edge_targets,
+            deterministic and "" not in automaton.alphabet,
+        )
+
+    def __reduce__(self):
+        # Arrays loaded by binary_format are memoryviews over a mapped file,
+        # which cannot be pickled; copy them for worker processes.
+        return self.__class__, (
+            self.symbols,
+            self.start_state,
+            array("q", self.state_labels),
+            bytes(self.accept),
+            array("I", self.offsets),
+            array("I", self.edge_symbols),
+            array("I", self.edge_targets),
+            self.deterministic,
+        )
+
+    def is_accepting(self, state: int) -> bool:
+        return bool(self.accept[state >> 3] >> (state & 7) & 1)
+
+    @property
+    def alphabet(self) -> set[str]:
+        return set(self.symbols[1:])
+
+    def has_epsilon(self, state: int) -> bool:
+        start = self.offsets[state]
+        return start < self.offsets[state + 1] and self.edge_symbols[start] == 0
+
+    def successors(self, state: int, symbol_id: int) -> Iterator[int]:
+        start, end = self.offsets[state], self.offsets[state + 1]
+        low = bisect_left(self.edge_symbols, symbol_id, start, end)
+        high = bisect_right(self.edge_symbols, symbol_id, low, end)
+        for edge in range(low, high):
+            yield self.edge_targets[edge]
+
+    def edges(self, state: int) -> Iterator[tuple[int, int]]:
+        for edge in range(self.offsets[state], self.offsets[state + 1]):
+            yield self.edge_symbols[edge], self.edge_targets[edge]
+
+    def epsilon_closure(self, states: set[int]) -> set[int]:
+        closure = set(states)
+        stack = list(states)
+        while stack:
+            for next_state in self.successors(stack.pop(), 0):
+                if next_state not in closure:
+                    closure.add(next_state)
+                    stack.append(next_state)
+        return closure
+
+    def simulate(self, input_str: str) -> bool:
+        current_states = self.epsilon_closure({self.start_state})
+        for symbol in input_str:
+            symbol_id = self.symbol_ids.get(symbol)
+            if not symbol_id:
+                return False
+            next_states = set()
+            for state in current_states:
+                next_states.update(self.successors(state, symbol_id))
+            current_states = self.epsilon_closure(next_states)
+            if not current_states:
+                return False
+        return any(self.is_accepting(state) for state in current_states)
+
+    def to_transitions(self) -> dict[int, dict[str, list[int]]]:
+        """Returns the NFA-style transitions over the original state labels."""
+        labels = self.state_labels
+        transitions = {}
+        for state in range(self.num_states):
+            row = transitions[labels[state]] = {}
+            for symbol_id, target in self.edges(state):
+                row.setdefault(self.symbols[symbol_id], []).append(labels[target])
+        return transitions
+
+    @property
+    def accept_states(self) -> list[int]:
+        return [
+            self.state_labels[state]
+            for state in range(self.num_states)
+            if self.is_accepting(state)
+        ]
@@ -0,0 +1,97 @@
+import sys
+import threading
+from collections import OrderedDict
+from src.dfa import DFA, FrozenDFA
+from src.regex import RegularExpression
+
+
+class CompileCache:
+    """
+    Bounded LRU cache from normalized regex text to its minimized DFA.
+
+    The text is taken after the "+" -> "|" rewrite done by
+    RegularExpression, so "a+b" and "a|b" share an entry. Cached automata
+    are shared between all callers as read-only FrozenDFA instances.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("Cache limits must be positive")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[FrozenDFA, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, regex: RegularExpression | str) -> FrozenDFA:
+        if not isinstance(regex, RegularExpression):
+            regex = RegularExpression(regex, read_files=False)
+        key = regex.get_regex()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        minimized = DFA.from_regex(regex).minimize()
+        size = self._estimate_size(key, minimized)
+        dfa = minimized.freeze()
+        if size > self.max_bytes:
+            return dfa
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[0]
+            self._entries[key] = (dfa, size)
+            self.current_bytes += size
+            self._evict()
+        return dfa
+
+    def _evict(self) -> None:
+        while (
+            len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+    @staticmethod
+    def _estimate_size(key: str, dfa: DFA) -> int:
+        size = sys.getsizeof(key) + sys.getsizeof(dfa) + sys.getsizeof(dfa.__dict__)
+        size += sys.getsizeof(dfa.states) + sys.getsizeof(dfa.accept_states)
+        size += sys.getsizeof(dfa.alphabet) + sys.getsizeof(dfa.transitions)
+        size += sum(sys.getsizeof(row) for row in dfa.transitions.values())
+        return size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, regex: RegularExpression | str) -> bool:
+        if not isinstance(regex, RegularExpression):
+            regex = RegularExpression(regex, read_files=False)
+        return regex.get_regex() in self._entries
+
+
+_default_cache = CompileCache()
+
+
+def get_default_cache() -> CompileCache:
+    return _default_cache
+
+
+def compile_regex(regex: RegularExpression | str) -> FrozenDFA:
+    """Returns the shared minimized DFA for regex from the process-wide cache."""
+    return _default_cache.get(regex)
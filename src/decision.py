@@ -0,0 +1,191 @@
+from collections import deque
+from typing import Iterator
+from src.bitset_nfa import BitsetNFA
+
+
+class CheckResult:
+    """
+    Outcome of a language check. Truthy when the property holds, otherwise
+    counterexample is a shortest word witnessing the failure.
+    """
+
+    __slots__ = ("holds", "counterexample")
+
+    def __init__(self, holds: bool, counterexample: str | None = None):
+        self.holds = holds
+        self.counterexample = counterexample
+
+    def __bool__(self) -> bool:
+        return self.holds
+
+    def __repr__(self) -> str:
+        if self.holds:
+            return "CheckResult(True)"
+        return f"CheckResult(False, counterexample={self.counterexample!r})"
+
+
+class _Antichain:
+    """For every key, the minimal masks seen so far."""
+
+    def __init__(self):
+        self._masks: dict[int, list[int]] = {}
+
+    def add(self, key: int, mask: int) -> bool:
+        """Adds mask unless a subset of it is already stored."""
+        masks = self._masks.setdefault(key, [])
+        for stored in masks:
+            if stored & ~mask == 0:
+                return False
+        masks[:] = [stored for stored in masks if mask & ~stored != 0]
+        masks.append(mask)
+        return True
+
+
+def _bits(mask: int) -> Iterator[int]:
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
+
+
+def _word(parents: list[tuple[int, str]], node: int) -> str:
+    symbols = []
+    while node:
+        node, symbol = parents[node]
+        symbols.append(symbol)
+    return "".join(reversed(symbols))
+
+
+def check_emptiness(nfa: BitsetNFA) -> CheckResult:
+    """BFS over single states; the counterexample is a shortest accepted word."""
+    symbols = sorted(nfa.alphabet)
+    parents = [(0, "")]
+    nodes = {}
+    queue = deque()
+    for state in _bits(nfa.start_state):
+        nodes[state] = 0
+        queue.append(state)
+    while queue:
+        state = queue.popleft()
+        if nfa.accept_mask >> state & 1:
+            return CheckResult(False, _word(parents, nodes[state]))
+        for symbol in symbols:
+            for next_state in _bits(nfa.successors[symbol][state]):
+                if next_state not in nodes:
+                    nodes[next_state] = len(parents)
+                    parents.append((nodes[state], symbol))
+                    queue.append(next_state)
+    return CheckResult(True)
+
+
+def check_universality(nfa: BitsetNFA, alphabet: set[str]) -> CheckResult:
+    """
+    Subset construction by BFS, pruned by an antichain: a state set is not
+    explored when a subset of it was already reached, since every word
+    rejected from the superset is rejected from the subset too.
+    """
+    symbols = sorted(alphabet)
+    antichain = _Antichain()
+    antichain.add(0, nfa.start_state)
+    parents = [(0, "")]
+    queue = deque([(nfa.start_state, 0)])
+    while queue:
+        mask, node = queue.popleft()
+        if not nfa.is_accepting(mask):
+            return CheckResult(False, _word(parents, node))
+        for symbol in symbols:
+            next_mask = nfa.step(mask, symbol)
+            if antichain.add(0, next_mask):
+                parents.append((node, symbol))
+                queue.append((next_mask, len(parents) - 1))
+    return CheckResult(True)
+
+
+def check_inclusion(left: BitsetNFA, right: BitsetNFA) -> CheckResult:
+    """
+    Checks L(left) ⊆ L(right) over pairs (state of left, state set of
+    right). A pair is pruned when a pair with the same left state and a
+    subset of its right states was already reached, so the subset
+    construction of right is only explored as far as needed.
+    """
+    symbols = sorted(left.alphabet)
+    antichain = _Antichain()
+    parents = [(0, "")]
+    queue = deque()
+    for state in _bits(left.start_state):
+        if antichain.add(state, right.start_state):
+            queue.append((state, right.start_state, 0))
+    while queue:
+        state, mask, node = queue.popleft()
+        if left.accept_mask >> state & 1 and not right.is_accepting(mask):
+            return CheckResult(False, _word(parents, node))
+        for symbol in symbols:
+            next_states = left.successors[symbol][state]
+            if not next_states:
+                continue
+            next_mask = right.step(mask, symbol)
+            for next_state in _bits(next_states):
+                if antichain.add(next_state, next_mask):
+                    parents.append((node, symbol))
+                    queue.append((next_state, next_mask, len(parents) - 1))
+    return CheckResult(True)
+
+
+def check_equivalence(left, right, alphabet: set[str]) -> CheckResult:
+    """
+    Hopcroft–Karp equivalence of two steppers: pairs of states reached by
+    the same word are merged in a union-find and only pairs from different
+    classes are explored, which takes near-linear time in the number of
+    states of the determinized operands. For NFAs (BitsetNFA steppers)
+    the subset construction happens on the fly.
+    """
+    symbols = sorted(alphabet)
+    parent: dict[tuple, tuple] = {}
+
+    def find(node: tuple) -> tuple:
+        root = node
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while node != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    start = (left.start_state, right.start_state)
+    parent[(0, start[0])] = (1, start[1])
+    stack = [start]
+    while stack:
+        state, other_state = stack.pop()
+        if left.is_accepting(state) != right.is_accepting(other_state):
+            return CheckResult(False, _distinguishing_word(left, right, symbols))
+        if left.is_dead(state) and right.is_dead(other_state):
+            continue
+        for symbol in symbols:
+            next_state = left.step(state, symbol)
+            next_other_state = right.step(other_state, symbol)
+            root, other_root = find((0, next_state)), find((1, next_other_state))
+            if root != other_root:
+                parent[root] = other_root
+                stack.append((next_state, next_other_state))
+    return CheckResult(True)
+
+
+def _distinguishing_word(left, right, symbols: list[str]) -> str:
+    """BFS over the product for a shortest word accepted by exactly one side."""
+    start = (left.start_state, right.start_state)
+    nodes = {start: 0}
+    parents = [(0, "")]
+    queue = deque([start])
+    while queue:
+        pair = queue.popleft()
+        state, other_state = pair
+        if left.is_accepting(state) != right.is_accepting(other_state):
+            return _word(parents, nodes[pair])
+        if left.is_dead(state) and right.is_dead(other_state):
+            continue
+        for symbol in symbols:
+            next_pair = (left.step(state, symbol), right.step(other_state, symbol))
+            if next_pair not in nodes:
+                nodes[next_pair] = len(parents)
+                parents.append((nodes[pair], symbol))
+                queue.append(next_pair)
+    raise ValueError("Automata are equivalent")
@@ -0,0 +1,172 @@
+from src.regex_ast import (
+    EMPTY,
+    EPSILON,
+    CharClass,
+    Concat,
+    Node,
+    Repeat,
+    Star,
+    Symbol,
+    Union,
+    postorder,
+)
+
+
+class DerivativeMatcher:
+    """
+    Lazily built DFA whose states are Brzozowski derivatives of a regex.
+
+    Every term is normalized modulo associativity, commutativity and
+    idempotence of "|" and hash-consed, so equal derivatives share a state.
+    A state and its outgoing transition are only computed the first time
+    the input reaches them.
+    """
+
+    def __init__(self, ast: Node):
+        self._interned: dict[Node, Node] = {}
+        self._rank: dict[Node, int] = {}
+        self._derivatives: dict[tuple[Node, str], Node] = {}
+
+        self.states: list[Node] = []
+        self._state_ids: dict[Node, int] = {}
+        self._transitions: list[dict[str, int]] = []
+
+        self.start_state = self._get_state(self._normalize(ast))
+        self.dead_state = self._get_state(self._intern(EMPTY))
+
+    def simulate(self, input_str: str) -> bool:
+        state = self.start_state
+        for symbol in input_str:
+            state = self.step(state, symbol)
+            if state == self.dead_state:
+                return False
+        return self.is_accepting(state)
+
+    def step(self, state: int, symbol: str) -> int:
+        next_state = self._transitions[state].get(symbol)
+        if next_state is None:
+            derivative = self._derivative(self.states[state], symbol)
+            next_state = self._get_state(derivative)
+            self._transitions[state][symbol] = next_state
+        return next_state
+
+    def is_accepting(self, state: int) -> bool:
+        return self.states[state].nullable
+
+    def _get_state(self, node: Node) -> int:
+        state = self._state_ids.get(node)
+        if state is None:
+            state = len(self.states)
+            self._state_ids[node] = state
+            self.states.append(node)
+            self._transitions.append({})
+        return state
+
+    def _intern(self, node: Node) -> Node:
+        canonical = self._interned.get(node)
+        if canonical is None:
+            canonical = node
+            self._interned[node] = node
+            self._rank[node] = len(self._rank)
+        return canonical
+
+    def _normalize(self, ast: Node) -> Node:
+        stack: list[Node] = []
+        for node in postorder(ast):
+            if isinstance(node, Star):
+                stack.append(self._star(stack.pop()))
+            elif isinstance(node, Repeat):
+                stack.append(self._repeat(stack.pop(), node.min, node.max))
+            elif isinstance(node, (Concat, Union)):
+                operands = stack[-len(node.items) :]
+                del stack[-len(node.items) :]
+                if isinstance(node, Concat):
+                    stack.append(self._concat(operands))
+                else:
+                    stack.append(self._union(operands))
+            else:
+                stack.append(self._intern(node))
+        return stack.pop()
+
+    def _concat(self, items) -> Node:
+        flat = []
+        for item in items:
+            if item is EMPTY:
+                return self._intern(EMPTY)
+            if isinstance(item, Concat):
+                flat.extend(item.items)
+            elif item is not EPSILON:
+                flat.append(item)
+        if not flat:
+            return self._intern(EPSILON)
+        if len(flat) == 1:
+            return flat[0]
+        return self._intern(Concat(tuple(flat)))
+
+    def _union(self, items) -> Node:
+        unique = {}
+        for item in items:
+            if isinstance(item, Union):
+                unique.update(dict.fromkeys(item.items))
+            elif item is not EMPTY:
+                unique[item] = None
+        if not unique:
+            return self._intern(EMPTY)
+        if len(unique) == 1:
+            return next(iter(unique))
+        return self._intern(Union(tuple(sorted(unique, key=self._rank.__getitem__))))
+
+    def _star(self, item: Node) -> Node:
+        if item is EMPTY or item is EPSILON:
+            return self._intern(EPSILON)
+        if isinstance(item, Star):
+            return item
+        return self._intern(Star(item))
+
+    def _repeat(self, item: Node, min_count: int, max_count: int | None) -> Node:
+        if max_count == 0 or item is EPSILON:
+            return self._intern(EPSILON)
+        if item is EMPTY:
+            return self._intern(EPSILON if min_count == 0 else EMPTY)
+        if min_count == 0 and max_count is None:
+            return self._star(item)
+        if min_count == max_count == 1:
+            return item
+        return self._intern(Repeat(item, min_count, max_count))
+
+    def _derivative(self, node: Node, symbol: str) -> Node:
+        key = (node, symbol)
+        derivative = self._derivatives.get(key)
+        if derivative is not None:
+            return derivative
+
+        if isinstance(node, Symbol):
+            derivative = self._intern(EPSILON if node.char == symbol else EMPTY)
+        elif isinstance(node, CharClass):
+            derivative = self._intern(EPSILON if symbol in node.chars else EMPTY)
+        elif isinstance(node, Repeat):
+            rest = self._repeat(
+                node.item,
+                max(node.min - 1, 0),
+                None if node.max is None else node.max - 1,
+            )
+            derivative = self._concat((self._derivative(node.item, symbol), rest))
+        elif isinstance(node, Star):
+            derivative = self._concat((self._derivative(node.item, symbol), node))
+        elif isinstance(node, Union):
+            derivative = self._union(
+                self._derivative(item, symbol) for item in node.items
+            )
+        elif isinstance(node, Concat):
+            terms = []
+            for index, item in enumerate(node.items):
+                rest = self._concat(node.items[index + 1 :])
+                terms.append(self._concat((self._derivative(item, symbol), rest)))
+                if not item.nullable:
+                    break
+            derivative = self._union(terms)
+        else:
+            derivative = self._intern(EMPTY)
+
+        self._derivatives[key] = derivative
+        return derivative
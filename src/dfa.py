@@ -1,20 +1,69 @@
 from copy import deepcopy
+from types import MappingProxyType
 from src.nfa import NFA
+from src.bitset_nfa import BitsetNFA
 from src.regex import RegularExpression
 from src.finite_automaton import FiniteAutomaton
+from src.compact import CompactAutomaton
+from src.state_elimination import eliminate_states
+from src.matcher import DFAStepper
+from src.numpy_dfa import DenseDFA
+from src.codegen import CompiledDFA, generate_source
+from src.parallel_subset import parallel_subset_construction
+from src.graph_analysis import useful_states
 
 
 class DFA(FiniteAutomaton):
     @classmethod
-    def from_nfa(cls, nfa: NFA) -> "DFA":
+    def from_nfa(
+        cls,
+        nfa: NFA | CompactAutomaton,
+        method: str = "sets",
+        processes: int | None = None,
+    ) -> "DFA":
+        """
+        Determinizes nfa by the subset construction.
+
+        method="sets" (the default) is the original construction over
+        frozensets. method="bitset" encodes state sets as int bitmasks over a
+        BitsetNFA, whose successor masks already include epsilon closures,
+        and numbers DFA states in BFS order over sorted symbols; it pays off
+        when the DFA is large relative to the NFA, while on unions of many
+        words building the BitsetNFA costs more than it saves.
+        method="parallel" gives the same DFA as "bitset", expanding BFS
+        levels on a pool of processes workers.
+
+        nfa may be a CompactAutomaton (e.g. from binary_format.load); the
+        bitset and parallel methods read its arrays directly.
+        """
+        if method == "bitset":
+            return cls._from_nfa_bitset(nfa)
+        if method == "parallel":
+            transitions, accept_states = parallel_subset_construction(nfa, processes)
+            dfa = cls()
+            dfa.alphabet = nfa.alphabet - {""}
+            dfa.start_state = 0
+            dfa.states = list(range(len(transitions)))
+            dfa.transitions = dict(enumerate(transitions))
+            dfa.accept_states = accept_states
+            return dfa
+        if method != "sets":
+            raise ValueError(f"Unknown determinization method: {method}")
+        if isinstance(nfa, CompactAutomaton):
+            nfa = NFA.from_compact(nfa)
+
         dfa = cls()
         dfa.alphabet = nfa.alphabet - {""}  # remove epsilon
 
-        epsilon_closure = nfa._compute_epsilon_closure()
+        epsilon_closure = (
+            nfa._compute_epsilon_closure() if nfa._has_epsilon_transitions() else None
+        )
         nfa_to_dfa_states: dict[frozenset[int], int] = {}
 
         dfa.start_state = 0
-        start_state_set = frozenset(epsilon_closure[nfa.start_state])
+        start_state_set = frozenset(
+            epsilon_closure[nfa.start_state] if epsilon_closure else {nfa.start_state}
+        )
         nfa_to_dfa_states[start_state_set] = 0
         dfa.states = [0]
         dfa.transitions[0] = {}
@@ -46,16 +95,46 @@ class DFA(FiniteAutomaton):
 
         return dfa
 
+    @classmethod
+    def _from_nfa_bitset(cls, nfa: NFA | CompactAutomaton) -> "DFA":
+        bitset = BitsetNFA(nfa)
+        symbols = sorted(bitset.alphabet)
+        dfa = cls()
+        dfa.alphabet = set(bitset.alphabet)
+        dfa.start_state = 0
+
+        masks = [bitset.start_state]
+        mask_ids = {bitset.start_state: 0}
+        for current_dfa_state, mask in enumerate(masks):
+            transitions = dfa.transitions[current_dfa_state] = {}
+            next_masks = bitset.successor_masks(mask, symbols)
+            for symbol, next_mask in zip(symbols, next_masks):
+                if not next_mask:
+                    continue
+                next_dfa_state = mask_ids.get(next_mask)
+                if next_dfa_state is None:
+                    next_dfa_state = mask_ids[next_mask] = len(masks)
+                    masks.append(next_mask)
+                transitions[symbol] = next_dfa_state
+            if mask & bitset.accept_mask:
+                dfa.accept_states.append(current_dfa_state)
+
+        dfa.states = list(range(len(masks)))
+        return dfa
+
     @staticmethod
     def _get_next_state_set(
         nfa: NFA,
         current_state_set: frozenset[int],
         symbol: str,
-        epsilon_closure: dict[int, set[int]],
+        epsilon_closure: dict[int, set[int]] | None,
     ) -> set[int]:
         next_state_set = set()
         for nfa_state in current_state_set:
             next_nfa_states = nfa.transitions.get(nfa_state, {}).get(symbol, [])
+            if epsilon_closure is None:
+                next_state_set.update(next_nfa_states)
+                continue
             for next_nfa_state in next_nfa_states:
                 next_state_set.update(epsilon_closure[next_nfa_state])
         return next_state_set
@@ -83,8 +162,8 @@ class DFA(FiniteAutomaton):
         return any(state in nfa.accept_states for state in state_set)
 
     @classmethod
-    def from_regex(cls, regex: RegularExpression) -> "DFA":
-        nfa = NFA.from_regex(regex)
+    def from_regex(cls, regex: RegularExpression, method: str = "thompson") -> "DFA":
+        nfa = NFA.from_regex(regex, method)
         return cls.from_nfa(nfa)
 
     def simulate(self, input_str: str) -> bool:
@@ -99,6 +178,27 @@ class DFA(FiniteAutomaton):
 
         return current_state in self.accept_states
 
+    def stepper(self) -> DFAStepper:
+        return DFAStepper(self)
+
+    def compile(self) -> CompiledDFA:
+        """
+        Generates and compiles a Python matcher specialized to this DFA;
+        calling the result is several times faster than simulate.
+        """
+        return CompiledDFA(generate_source(self))
+
+    def freeze(self) -> "FrozenDFA":
+        """Returns a read-only copy that can be shared between callers."""
+        return FrozenDFA(self)
+
+    def to_numpy(self) -> DenseDFA:
+        """
+        Compiles the DFA into a dense NumPy transition table with a batch
+        simulate_many(words). Requires NumPy.
+        """
+        return DenseDFA(self)
+
     def is_complete(self) -> bool:
         return all(
             set(self.transitions.get(state, {}).keys()) == self.alphabet
@@ -113,15 +213,15 @@ class DFA(FiniteAutomaton):
             return self
 
         complete_dfa = DFA()
-        complete_dfa.states = self.states + [len(self.states)]
-        complete_dfa.alphabet = self.alphabet.copy()
+        complete_dfa.states = [*self.states, len(self.states)]
+        complete_dfa.alphabet = set(self.alphabet)
         complete_dfa.transitions = {i: {} for i in complete_dfa.states}
 
         for state, transitions in self.transitions.items():
             complete_dfa.transitions[state] = transitions.copy()
 
         complete_dfa.start_state = self.start_state
-        complete_dfa.accept_states = self.accept_states.copy()
+        complete_dfa.accept_states = list(self.accept_states)
 
         trap_state = len(self.states)
 
@@ -153,7 +253,20 @@ class DFA(FiniteAutomaton):
 
         return complete_dfa
 
-    def minimize(self) -> "DFA":
+    def minimize(self, method: str = "hopcroft") -> "DFA":
+        """
+        Returns the minimal DFA of the language.
+
+        method="hopcroft" refines partitions in O(m log n) directly on the
+        partial DFA and returns a partial DFA without unreachable or dead
+        states. method="table" is the quadratic table-filling algorithm on
+        the completed DFA.
+        """
+        if method == "hopcroft":
+            return self._minimize_hopcroft()
+        if method != "table":
+            raise ValueError(f"Unknown minimization method: {method}")
+
         if not self.is_complete():
             complete_dfa = self.make_complete()
         else:
@@ -161,6 +274,81 @@ class DFA(FiniteAutomaton):
 
         return complete_dfa._minimize_complete_dfa()
 
+    def _minimize_hopcroft(self) -> "DFA":
+        minimized_dfa = DFA()
+        minimized_dfa.alphabet = set(self.alphabet)
+        useful = useful_states(self.start_state, self.accept_states, self.transitions)
+        if self.start_state not in useful:
+            minimized_dfa.states = [0]
+            minimized_dfa.start_state = 0
+            minimized_dfa.transitions = {0: {}}
+            return minimized_dfa
+
+        states = sorted(useful)
+        index = {state: i for i, state in enumerate(states)}
+        predecessors: list[list[tuple[str, int]]] = [[] for _ in states]
+        for state in states:
+            for symbol, next_state in self.transitions.get(state, {}).items():
+                if next_state in useful:
+                    predecessors[index[next_state]].append((symbol, index[state]))
+
+        accepting = {index[state] for state in self.accept_states if state in useful}
+        blocks = [
+            block for block in (accepting, set(index.values()) - accepting) if block
+        ]
+        block_of = [0] * len(states)
+        for block_id, block in enumerate(blocks):
+            for i in block:
+                block_of[i] = block_id
+
+        splitters = list(range(len(blocks)))
+        pending = set(splitters)
+        while splitters:
+            splitter = splitters.pop()
+            pending.discard(splitter)
+            sources: dict[str, list[int]] = {}
+            for i in list(blocks[splitter]):
+                for symbol, source in predecessors[i]:
+                    sources.setdefault(symbol, []).append(source)
+
+            for touched in sources.values():
+                groups: dict[int, list[int]] = {}
+                for i in touched:
+                    groups.setdefault(block_of[i], []).append(i)
+                for block_id, members in groups.items():
+                    block = blocks[block_id]
+                    if len(members) == len(block):
+                        continue
+                    new_block_id = len(blocks)
+                    blocks.append(set(members))
+                    block -= blocks[new_block_id]
+                    for i in members:
+                        block_of[i] = new_block_id
+                    if block_id in pending or len(members) <= len(block):
+                        new_splitter = new_block_id
+                    else:
+                        new_splitter = block_id
+                    splitters.append(new_splitter)
+                    pending.add(new_splitter)
+
+        order = sorted(range(len(blocks)), key=lambda block_id: min(blocks[block_id]))
+        numbering = {block_id: number for number, block_id in enumerate(order)}
+        component = {state: numbering[block_of[index[state]]] for state in states}
+
+        minimized_dfa.states = list(range(len(blocks)))
+        minimized_dfa.start_state = component[self.start_state]
+        minimized_dfa.accept_states = sorted(
+            {component[state] for state in self.accept_states if state in useful}
+        )
+        minimized_dfa.transitions = {i: {} for i in minimized_dfa.states}
+        for state in states:
+            minimized_dfa.transitions[component[state]] = {
+                symbol: component[next_state]
+                for symbol, next_state in self.transitions.get(state, {}).items()
+                if next_state in useful
+            }
+        return minimized_dfa
+
     def _minimize_complete_dfa(self) -> "DFA":
         n = len(self.states)
 
@@ -215,7 +403,7 @@ class DFA(FiniteAutomaton):
 
         minimized_dfa = DFA()
         minimized_dfa.states = list(range(components_count))
-        minimized_dfa.alphabet = self.alphabet.copy()
+        minimized_dfa.alphabet = set(self.alphabet)
         minimized_dfa.start_state = component[self.start_state]
         minimized_dfa.accept_states = list(
             set(component[state] for state in self.accept_states)
@@ -231,112 +419,31 @@ class DFA(FiniteAutomaton):
 
         return minimized_dfa
 
-    def to_regex(self) -> "RegularExpression":
-        dfa = deepcopy(self)
-
-        regex_transitions = {}
-        for state in dfa.states:
-            regex_transitions[state] = {}
-        for state in dfa.states:
-            for symbol in dfa.alphabet:
-                next_state = dfa.transitions.get(state, {}).get(symbol)
+    def to_regex(self, strategy: str = "order") -> "RegularExpression":
+        """
+        Builds a regular expression by state elimination. strategy picks
+        the elimination order: "order", "degree", "weight" or "dynamic"
+        (see src/state_elimination.py).
+        """
+        regex_transitions = {state: {} for state in self.states}
+        for state in self.states:
+            for symbol in self.alphabet:
+                next_state = self.transitions.get(state, {}).get(symbol)
                 if next_state is not None:
-                    if next_state not in regex_transitions[state]:
-                        regex_transitions[state][next_state] = set()
-                    regex_transitions[state][next_state].add(symbol)
-
-        new_start_state = max(dfa.states) + 1
-        dfa.states.append(new_start_state)
-        regex_transitions[new_start_state] = {}
-        regex_transitions[new_start_state][dfa.start_state] = set(["ε"])
-        dfa.start_state = new_start_state
-
-        new_accept_state = max(dfa.states) + 1
-        dfa.states.append(new_accept_state)
-        for accept_state in dfa.accept_states:
-            if accept_state not in regex_transitions:
-                regex_transitions[accept_state] = {}
-            if new_accept_state not in regex_transitions[accept_state]:
-                regex_transitions[accept_state][new_accept_state] = set()
-            regex_transitions[accept_state][new_accept_state].add("ε")
-        dfa.accept_states = [new_accept_state]
-
-        states_to_eliminate = [
-            state
-            for state in dfa.states
-            if state not in (dfa.start_state, dfa.accept_states[0])
-        ]
-
-        while states_to_eliminate:
-            state_to_remove = states_to_eliminate.pop(0)
-
-            incoming = {}
-            outgoing = {}
-            self_loop = regex_transitions[state_to_remove].get(state_to_remove, set())
-            for src in regex_transitions:
-                for dst in regex_transitions[src]:
-                    if dst == state_to_remove and src != state_to_remove:
-                        incoming[src] = regex_transitions[src][dst]
-            for dst in regex_transitions[state_to_remove]:
-                if dst != state_to_remove:
-                    outgoing[dst] = regex_transitions[state_to_remove][dst]
-
-            if self_loop:
-                R_jj = (
-                    "+".join(sorted(self_loop))
-                    if len(self_loop) > 1
-                    else next(iter(self_loop))
-                )
-                R_jj_star = f"({R_jj})*"
-            else:
-                R_jj_star = "ε"
-
-            for src in incoming:
-                for dst in outgoing:
-                    for R_ij in incoming[src]:
-                        for R_jk in outgoing[dst]:
-                            R_ij_adj = "" if R_ij == "ε" else R_ij
-                            R_jj_star_adj = "" if R_jj_star == "ε" else R_jj_star
-                            R_jk_adj = "" if R_jk == "ε" else R_jk
-
-                            if R_ij_adj and ("+" in R_ij_adj or "*" in R_ij_adj):
-                                R_ij_adj = f"({R_ij_adj})"
-                            if R_jj_star_adj and (
-                                "+" in R_jj_star_adj or "*" in R_jj_star_adj
-                            ):
-                                R_jj_star_adj = f"({R_jj_star_adj})"
-                            if R_jk_adj and ("+" in R_jk_adj or "*" in R_jk_adj):
-                                R_jk_adj = f"({R_jk_adj})"
-
-                            new_regex = R_ij_adj + R_jj_star_adj + R_jk_adj
-
-                            if not new_regex:
-                                new_regex = "ε"
-
-                            if dst not in regex_transitions[src]:
-                                regex_transitions[src][dst] = set()
-                            regex_transitions[src][dst].add(new_regex)
-
-            for src in list(regex_transitions.keys()):
-                regex_transitions[src].pop(state_to_remove, None)
-            regex_transitions.pop(state_to_remove, None)
-
-        start = dfa.start_state
-        accept = dfa.accept_states[0]
-        res = ""
-        if accept in regex_transitions[start]:
-            final_regexes = regex_transitions[start][accept]
-            res = (
-                "+".join(sorted(final_regexes))
-                if len(final_regexes) > 1
-                else next(iter(final_regexes))
-            )
-        else:
-            res = "∅"
-
-        final_regex = RegularExpression(res.replace("ε", "")).fix()
-
-        return final_regex
+                    regex_transitions[state].setdefault(next_state, set()).add(symbol)
+
+        new_start_state = max(self.states) + 1
+        new_accept_state = new_start_state + 1
+        regex_transitions[new_start_state] = {self.start_state: {"ε"}}
+        for accept_state in self.accept_states:
+            regex_transitions.setdefault(accept_state, {}).setdefault(
+                new_accept_state, set()
+            ).add("ε")
+
+        res = eliminate_states(
+            regex_transitions, new_start_state, new_accept_state, strategy
+        )
+        return RegularExpression(res.replace("ε", "")).fix()
 
     @staticmethod
     def _combine_regexes(regexes):
@@ -349,6 +456,21 @@ class DFA(FiniteAutomaton):
             else regexes[0]
         )
 
+    @classmethod
+    def from_compact(cls, compact: CompactAutomaton) -> "DFA":
+        if not compact.deterministic:
+            raise ValueError("Compact automaton is not deterministic")
+        dfa = cls()
+        dfa.states = list(compact.state_labels)
+        dfa.alphabet = set(compact.symbols[1:])
+        dfa.start_state = compact.state_labels[compact.start_state]
+        dfa.accept_states = compact.accept_states
+        dfa.transitions = {
+            state: {symbol: next_states[0] for symbol, next_states in row.items()}
+            for state, row in compact.to_transitions().items()
+        }
+        return dfa
+
     @classmethod
     def from_string(cls, input_str: str) -> "DFA":
         lines = input_str.strip().split("\n")
@@ -384,3 +506,53 @@ class DFA(FiniteAutomaton):
                 output.append(f"{state} -> {symbol} -> {next_state}")
 
         return "\n".join(output)
+
+
+class FrozenDFA(DFA):
+    """
+    Read-only DFA: states and accept_states are tuples, the alphabet is a
+    frozenset and transitions are read-only mappings, attributes cannot be
+    reassigned. Every DFA operation returns a new ordinary DFA, and
+    copy.deepcopy gives a mutable copy.
+    """
+
+    def __init__(self, dfa: DFA):
+        fields = {
+            "states": tuple(dfa.states),
+            "alphabet": frozenset(dfa.alphabet),
+            "transitions": MappingProxyType(
+                {
+                    state: MappingProxyType(dict(row))
+                    for state, row in dfa.transitions.items()
+                }
+            ),
+            "start_state": dfa.start_state,
+            "accept_states": tuple(dfa.accept_states),
+        }
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def freeze(self) -> "FrozenDFA":
+        return self
+
+    def thaw(self) -> DFA:
+        """Returns a mutable copy."""
+        dfa = DFA()
+        dfa.states = list(self.states)
+        dfa.alphabet = set(self.alphabet)
+        dfa.transitions = {state: dict(row) for state, row in self.transitions.items()}
+        dfa.start_state = self.start_state
+        dfa.accept_states = list(self.accept_states)
+        return dfa
+
+    def __deepcopy__(self, memo) -> DFA:
+        return self.thaw()
+
+    def __reduce__(self):
+        return self.__class__, (self.thaw(),)
@@ -1,7 +1,13 @@
 from abc import ABC, abstractmethod
+from typing import Iterable, Iterator
+from src.compact import CompactAutomaton
+from src import binary_format
+from src.matcher import StreamMatcher, simulate_many
+from src.product import BooleanOperations
+from src.decision import CheckResult, check_equivalence
 
 
-class FiniteAutomaton(ABC):
+class FiniteAutomaton(ABC, BooleanOperations):
     def __init__(self):
         self.states = []
         self.alphabet = set()
@@ -37,6 +43,51 @@ class FiniteAutomaton(ABC):
     def print(self):
         print(str(self))
 
+    @abstractmethod
+    def stepper(self):
+        """
+        Returns the automaton as a stepper: start_state, step(state, symbol),
+        is_accepting(state) and is_dead(state). Matchers, batch simulation
+        and product automata run on top of it.
+        """
+        pass
+
+    def simulate_many(self, words: Iterable[str]) -> list[bool] | Iterator[bool]:
+        """
+        Checks many words at once. Lists and tuples give a list of results
+        in input order, other iterables give a lazy iterator.
+        """
+        return simulate_many(self.stepper(), words)
+
+    def matcher(self) -> StreamMatcher:
+        """Returns a resumable matcher fed with chunks of input."""
+        return StreamMatcher(self.stepper())
+
+    def equivalent(self, other: "FiniteAutomaton") -> CheckResult:
+        """
+        Holds when both automata accept the same language; otherwise gives a
+        shortest word accepted by exactly one of them. Neither side is
+        minimized, NFAs are determinized on the fly.
+        """
+        return check_equivalence(
+            self.stepper(), other.stepper(), (self.alphabet | other.alphabet) - {""}
+        )
+
+    def to_compact(self) -> CompactAutomaton:
+        return CompactAutomaton.from_automaton(self)
+
+    def save(self, path: str) -> None:
+        """Writes the automaton to path in the binary format of src.binary_format."""
+        binary_format.save(self.to_compact(), path)
+
+    @classmethod
+    def load(cls, path: str) -> "FiniteAutomaton":
+        """
+        Reads an automaton written by save(). For matching without copying
+        the file into dicts, use binary_format.load(path) directly.
+        """
+        return cls.from_compact(binary_format.load(path))
+
     @classmethod
     @abstractmethod
     def from_string(cls, input_str: str) -> "FiniteAutomaton":
@@ -0,0 +1,126 @@
+from collections import deque
+from typing import Iterable
+
+
+def _targets(next_states) -> Iterable[int]:
+    return (next_states,) if isinstance(next_states, int) else next_states
+
+
+def _all_states(states: Iterable[int], transitions: dict) -> list[int]:
+    result = list(states)
+    for state, row in transitions.items():
+        result.append(state)
+        for next_states in row.values():
+            result.extend(_targets(next_states))
+    return list(dict.fromkeys(result))
+
+
+def epsilon_closures(
+    states: Iterable[int], transitions: dict
+) -> dict[int, frozenset[int]]:
+    """
+    Epsilon closure of every state in O(n + m) traversal work.
+
+    The epsilon graph is condensed into strongly connected components with
+    an iterative Tarjan search. Components are finished in reverse
+    topological order, so the closure of a component is its members plus
+    the already computed closures of its successors, and all members share
+    one frozenset.
+    """
+    epsilon_edges = {
+        state: transitions.get(state, {}).get("", ())
+        for state in _all_states(states, transitions)
+    }
+    index: dict[int, int] = {}
+    low: dict[int, int] = {}
+    component_stack: list[int] = []
+    on_stack: set[int] = set()
+    closures: dict[int, frozenset[int]] = {}
+
+    for root in epsilon_edges:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        component_stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(epsilon_edges[root]))]
+
+        while work:
+            state, successors = work[-1]
+            descended = False
+            for next_state in successors:
+                if next_state not in index:
+                    index[next_state] = low[next_state] = len(index)
+                    component_stack.append(next_state)
+                    on_stack.add(next_state)
+                    work.append((next_state, iter(epsilon_edges[next_state])))
+                    descended = True
+                    break
+                if next_state in on_stack:
+                    low[state] = min(low[state], index[next_state])
+            if descended:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[state])
+            if low[state] != index[state]:
+                continue
+
+            members = set()
+            while True:
+                member = component_stack.pop()
+                on_stack.discard(member)
+                members.add(member)
+                if member == state:
+                    break
+            closure = set(members)
+            for member in members:
+                for next_state in epsilon_edges[member]:
+                    if next_state not in members:
+                        closure |= closures[next_state]
+            closure = frozenset(closure)
+            for member in members:
+                closures[member] = closure
+
+    return closures
+
+
+def reachable_states(start_state: int, transitions: dict) -> set[int]:
+    reachable = {start_state}
+    queue = deque([start_state])
+    while queue:
+        for next_states in transitions.get(queue.popleft(), {}).values():
+            for next_state in _targets(next_states):
+                if next_state not in reachable:
+                    reachable.add(next_state)
+                    queue.append(next_state)
+    return reachable
+
+
+def productive_states(accept_states: Iterable[int], transitions: dict) -> set[int]:
+    """States from which an accept state is reachable, by one reverse BFS."""
+    predecessors: dict[int, list[int]] = {}
+    for state, row in transitions.items():
+        for next_states in row.values():
+            for next_state in _targets(next_states):
+                predecessors.setdefault(next_state, []).append(state)
+
+    productive = set(accept_states)
+    queue = deque(productive)
+    while queue:
+        for previous_state in predecessors.get(queue.popleft(), ()):
+            if previous_state not in productive:
+                productive.add(previous_state)
+                queue.append(previous_state)
+    return productive
+
+
+def useful_states(
+    start_state: int, accept_states: Iterable[int], transitions: dict
+) -> set[int]:
+    """States that are both reachable and productive."""
+    return reachable_states(start_state, transitions) & productive_states(
+        accept_states, transitions
+    )
@@ -0,0 +1,147 @@
+import sys
+from typing import TYPE_CHECKING, Iterable, Iterator
+from src.bitset_nfa import BitsetNFA
+from src.compact import CompactAutomaton
+from src.matcher import StreamMatcher, simulate_many
+
+if TYPE_CHECKING:
+    from src.nfa import NFA
+
+
+class LazyState:
+    """One cached DFA state: an NFA state set and its known transitions."""
+
+    __slots__ = ("mask", "accepting", "dead", "transitions", "generation")
+
+    def __init__(self, mask: int, accepting: bool, dead: bool, generation: int):
+        self.mask = mask
+        self.accepting = accepting
+        self.dead = dead
+        self.transitions: dict[str, "LazyState"] = {}
+        self.generation = generation
+
+
+class LazyDFA:
+    """
+    DFA built lazily while input is scanned, in the style of RE2.
+
+    States are NFA state sets (BitsetNFA masks) and each subset-to-subset
+    transition is computed once and cached. When the cache would exceed
+    max_states or max_bytes it is flushed as a whole and rebuilt from the
+    states in use; states from before a flush stay valid and are re-added
+    when stepped. Counters: hits, misses, flushes.
+    """
+
+    _STATE_BYTES = 200
+    _TRANSITION_BYTES = 100
+
+    def __init__(
+        self,
+        nfa: "NFA | CompactAutomaton",
+        max_states: int = 10000,
+        max_bytes: int = 8 * 1024 * 1024,
+    ):
+        if max_states < 2 or max_bytes < 1:
+            raise ValueError("Cache limits must be positive")
+        self.bitset = BitsetNFA(nfa)
+        self.alphabet = self.bitset.alphabet
+        self.max_states = max_states
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+        self.generation = 0
+        self._states: dict[int, LazyState] = {}
+        self._start_state = self._intern(self.bitset.start_state)
+
+    @property
+    def start_state(self) -> LazyState:
+        if self._start_state.generation != self.generation:
+            self._start_state = self._intern(self._start_state.mask)
+        return self._start_state
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def stepper(self) -> "LazyDFA":
+        return self
+
+    def step(self, state: LazyState, symbol: str) -> LazyState:
+        next_state = state.transitions.get(symbol)
+        if next_state is not None and state.generation == self.generation:
+            self.hits += 1
+            return next_state
+        return self._add_transition(state, symbol)
+
+    def is_accepting(self, state: LazyState) -> bool:
+        return state.accepting
+
+    def is_dead(self, state: LazyState) -> bool:
+        return state.dead
+
+    def simulate(self, input_str: str) -> bool:
+        state = self.start_state
+        hits = 0
+        for symbol in input_str:
+            next_state = state.transitions.get(symbol)
+            if next_state is None:
+                next_state = self._add_transition(state, symbol)
+            else:
+                hits += 1
+            if next_state.dead:
+                break
+            state = next_state
+        else:
+            self.hits += hits
+            return state.accepting
+        self.hits += hits
+        return False
+
+    def simulate_many(self, words: Iterable[str]) -> list[bool] | Iterator[bool]:
+        return simulate_many(self, words)
+
+    def matcher(self) -> StreamMatcher:
+        return StreamMatcher(self)
+
+    def flush(self) -> None:
+        """Drops every cached state and transition."""
+        self._states = {}
+        self.current_bytes = 0
+        self.generation += 1
+        self.flushes += 1
+
+    def _add_transition(self, state: LazyState, symbol: str) -> LazyState:
+        self.misses += 1
+        if state.generation != self.generation:
+            state = self._intern(state.mask)
+        next_mask = self.bitset.step(state.mask, symbol)
+        if self.current_bytes + self._TRANSITION_BYTES > self.max_bytes:
+            self.flush()
+            state = self._intern(state.mask)
+        next_state = self._intern(next_mask)
+        if state.generation != self.generation:
+            state = self._intern(state.mask)
+        state.transitions[symbol] = next_state
+        self.current_bytes += self._TRANSITION_BYTES
+        return next_state
+
+    def _intern(self, mask: int) -> LazyState:
+        state = self._states.get(mask)
+        if state is not None:
+            return state
+        size = self._STATE_BYTES + sys.getsizeof(mask)
+        if (
+            len(self._states) >= self.max_states
+            or self.current_bytes + size > self.max_bytes
+        ):
+            self.flush()
+        state = LazyState(
+            mask,
+            self.bitset.is_accepting(mask),
+            self.bitset.is_dead(mask),
+            self.generation,
+        )
+        self._states[mask] = state
+        self.current_bytes += size
+        return state
@@ -0,0 +1,121 @@
+from typing import TYPE_CHECKING, Iterable, Iterator, Sequence
+from src.graph_analysis import productive_states
+
+if TYPE_CHECKING:
+    from src.dfa import DFA
+
+
+class DFAStepper:
+    """
+    Steps a DFA one symbol at a time. A missing transition leads to the
+    implicit dead state None.
+    """
+
+    def __init__(self, dfa: "DFA"):
+        self.transitions = dfa.transitions
+        self.alphabet = dfa.alphabet
+        self.start_state = dfa.start_state
+        self.accept_states = set(dfa.accept_states)
+        self.live_states = productive_states(dfa.accept_states, dfa.transitions)
+
+    def step(self, state: int | None, symbol: str) -> int | None:
+        return self.transitions.get(state, {}).get(symbol)
+
+    def is_accepting(self, state: int | None) -> bool:
+        return state in self.accept_states
+
+    def is_dead(self, state: int | None) -> bool:
+        return state not in self.live_states
+
+
+class StreamMatcher:
+    """
+    Resumable matcher for input that arrives in chunks.
+
+    Works over a stepper (DFAStepper or BitsetNFA): the whole matching state
+    is one int (a DFA state or an NFA state bitmask), so memory does not
+    grow with the input and snapshot() / restore() are free. Once no
+    accepting path remains, feed() stops reading.
+    """
+
+    def __init__(self, stepper):
+        self.stepper = stepper
+        self.state = stepper.start_state
+
+    def feed(self, chunk: str) -> bool:
+        """Consumes chunk, returns False once the input can no longer match."""
+        stepper = self.stepper
+        state = self.state
+        if stepper.is_dead(state):
+            return False
+        for symbol in chunk:
+            state = stepper.step(state, symbol)
+            if stepper.is_dead(state):
+                self.state = state
+                return False
+        self.state = state
+        return True
+
+    def is_accepting(self) -> bool:
+        return self.stepper.is_accepting(self.state)
+
+    def is_dead(self) -> bool:
+        return self.stepper.is_dead(self.state)
+
+    def reset(self) -> None:
+        self.state = self.stepper.start_state
+
+    def snapshot(self) -> int | None:
+        return self.state
+
+    def restore(self, snapshot: int | None) -> None:
+        self.state = snapshot
+
+
+def simulate_many(stepper, words: Iterable[str]) -> list[bool] | Iterator[bool]:
+    """
+    Membership of many words, stepping every shared prefix once.
+
+    A sequence of words is walked in sorted order with a stack of the
+    states after each prefix of the previous word, and the results are
+    returned in input order. Any other iterable is consumed lazily, sharing
+    the prefix with the previous word only.
+    """
+    if not isinstance(words, Sequence) or isinstance(words, str):
+        return _walk_prefixes(stepper, words)
+    order = sorted(range(len(words)), key=words.__getitem__)
+    results = [False] * len(words)
+    sorted_words = (words[index] for index in order)
+    for index, accepted in zip(order, _walk_prefixes(stepper, sorted_words)):
+        results[index] = accepted
+    return results
+
+
+def _walk_prefixes(stepper, words: Iterable[str]) -> Iterator[bool]:
+    step, is_dead = stepper.step, stepper.is_dead
+    previous = ""
+    stack = [stepper.start_state]
+    for word in words:
+        common = _common_prefix_length(previous, word, len(stack) - 1)
+        del stack[common + 1 :]
+
+        state = stack[-1]
+        if not is_dead(state):
+            for symbol in word[common:]:
+                state = step(state, symbol)
+                stack.append(state)
+                if is_dead(state):
+                    break
+        previous = word
+        yield stepper.is_accepting(state)
+
+
+def _common_prefix_length(first: str, second: str, limit: int) -> int:
+    low, high = 0, min(len(first), len(second), limit)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if first[:middle] == second[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
@@ -1,162 +1,156 @@
-import copy
 from src.regex import RegularExpression
+from src.regex_ast import (
+    EMPTY,
+    EPSILON,
+    CharClass,
+    Concat,
+    Node,
+    Star,
+    Symbol,
+    expand_repeats,
+    postorder,
+    symbols,
+)
 from src.finite_automaton import FiniteAutomaton
+from src.bitset_nfa import BitsetNFA
+from src.lazy_dfa import LazyDFA
+from src.compact import CompactAutomaton
+from src.decision import (
+    CheckResult,
+    check_emptiness,
+    check_inclusion,
+    check_universality,
+)
+from src.state_elimination import eliminate_states
+from src.reduction import bisimulation_classes, reverse_transitions
+from src.graph_analysis import (
+    epsilon_closures,
+    productive_states,
+    reachable_states,
+    useful_states,
+)
 
 
 class NFA(FiniteAutomaton):
     @classmethod
-    def from_regex(cls, regex: RegularExpression) -> "NFA":
-        postfix_exp = regex.to_postfix()
-        nfa_stack = []
-        alphabet = set(char for char in postfix_exp if char.isalnum())
-        alphabet.add("")
-
-        for char in postfix_exp:
-            if char.isalnum():
-                nfa_stack.append(cls._get_alphabet_nfa(char, alphabet))
-            elif char == "|":
-                cls._handle_union(nfa_stack)
-            elif char == "*":
-                cls._handle_kleene_star(nfa_stack)
-            elif char == ".":
-                cls._handle_concatenation(nfa_stack)
-            elif char in ["(", ")"]:
-                raise ValueError(f"Unexpected character in postfix expression: {char}")
-            else:
+    def from_regex(cls, regex: RegularExpression, method: str = "thompson") -> "NFA":
+        """
+        Builds an NFA from a regular expression.
+
+        method="thompson" gives the classic construction with epsilon
+        transitions, method="glushkov" gives the position automaton: one
+        state per symbol occurrence plus the start state, no epsilon
+        transitions.
+        """
+        ast = expand_repeats(regex.to_ast())
+        alphabet = symbols(ast)
+        for char in alphabet:
+            if not char.isalnum():
                 raise ValueError(f"Invalid character in regex: {char}")
 
-        if len(nfa_stack) != 1:
-            raise ValueError("Invalid regex: mismatched operands")
+        if method == "glushkov":
+            return cls._glushkov_nfa(ast, alphabet)
+        if method != "thompson":
+            raise ValueError(f"Unknown construction method: {method}")
 
-        return nfa_stack.pop()
-
-    @staticmethod
-    def _handle_union(nfa_stack):
-        if len(nfa_stack) < 2:
-            if not nfa_stack:
-                nfa_stack.append(NFA._get_alphabet_nfa("", set("")))
-        else:
-            nfa2, nfa1 = nfa_stack.pop(), nfa_stack.pop()
-            nfa_stack.append(NFA._union_nfa(nfa1, nfa2))
-
-    @staticmethod
-    def _handle_kleene_star(nfa_stack):
-        if not nfa_stack:
-            raise ValueError(
-                "Invalid regex: not enough operands for Kleene star operation"
-            )
-        nfa_stack.append(NFA._kleene_star_nfa(nfa_stack.pop()))
+        alphabet.add("")
 
-    @staticmethod
-    def _handle_concatenation(nfa_stack):
-        if len(nfa_stack) < 2:
-            raise ValueError("Invalid regex: not enough operands for concatenation")
-        nfa2, nfa1 = nfa_stack.pop(), nfa_stack.pop()
-        nfa_stack.append(NFA._concat_nfa(nfa1, nfa2))
+        builder = _ThompsonBuilder()
+        fragments = []
+        for node in postorder(ast):
+            if isinstance(node, Symbol):
+                fragments.append(builder.symbols((node.char,)))
+            elif isinstance(node, CharClass):
+                fragments.append(builder.symbols(node.chars))
+            elif node is EPSILON:
+                fragments.append(builder.epsilon())
+            elif node is EMPTY:
+                fragments.append(builder.empty())
+            elif isinstance(node, Star):
+                fragments.append(builder.star(fragments.pop()))
+            else:
+                operands = fragments[-len(node.items) :]
+                del fragments[-len(node.items) :]
+                if isinstance(node, Concat):
+                    fragments.append(builder.concat(operands))
+                else:
+                    fragments.append(builder.union(operands))
 
-    @staticmethod
-    def _get_alphabet_nfa(character: str, alphabet: set[str]) -> "NFA":
-        nfa = NFA()
-        nfa.states = [0, 1]
-        nfa.start_state = 0
-        nfa.accept_states = [1]
+        start_state, accept_state = fragments.pop()
+        nfa = cls()
+        nfa.states = list(builder.transitions)
         nfa.alphabet = alphabet
-        nfa.transitions = {state: {a: [] for a in alphabet} for state in nfa.states}
-        nfa.transitions[0][character] = [1]
+        nfa.start_state = start_state
+        nfa.accept_states = [accept_state]
+        nfa.transitions = builder.transitions
         return nfa
 
-    @staticmethod
-    def _concat_nfa(nfa1: "NFA", nfa2: "NFA") -> "NFA":
-        nfa = NFA()
-        offset = max(nfa1.states) + 1
-        nfa.states = nfa1.states + [state + offset for state in nfa2.states]
-        nfa.start_state = nfa1.start_state
-        nfa.accept_states = [state + offset for state in nfa2.accept_states]
-        nfa.alphabet = nfa1.alphabet.union(nfa2.alphabet)
-        nfa.transitions = {
-            **nfa1.transitions,
-            **{
-                state
-                + offset: {
-                    a: [s + offset for s in next_states]
-                    for a, next_states in transitions.items()
-                }
-                for state, transitions in nfa2.transitions.items()
-            },
-        }
-        for state in nfa1.accept_states:
-            nfa.transitions.setdefault(state, {}).setdefault("", []).append(
-                nfa2.start_state + offset
-            )
-        return nfa
+    @classmethod
+    def _glushkov_nfa(cls, ast: Node, alphabet: set[str]) -> "NFA":
+        position_symbols: list[tuple[str, ...]] = [()]
+        follow: list[set[int]] = [set()]
+        first_last_stack: list[tuple[set[int], set[int]]] = []
+
+        for node in postorder(ast):
+            if isinstance(node, (Symbol, CharClass)):
+                position = len(position_symbols)
+                position_symbols.append(
+                    (node.char,) if isinstance(node, Symbol) else tuple(node.chars)
+                )
+                follow.append(set())
+                first_last_stack.append(({position}, {position}))
+            elif not node.children:
+                first_last_stack.append((set(), set()))
+            elif isinstance(node, Star):
+                first, last = first_last_stack[-1]
+                for position in last:
+                    follow[position] |= first
+            else:
+                operands = first_last_stack[-len(node.items) :]
+                del first_last_stack[-len(node.items) :]
+                if isinstance(node, Concat):
+                    first_last_stack.append(
+                        cls._glushkov_concat(node, operands, follow)
+                    )
+                else:
+                    first, last = set(), set()
+                    for operand_first, operand_last in operands:
+                        first |= operand_first
+                        last |= operand_last
+                    first_last_stack.append((first, last))
 
-    @staticmethod
-    def _union_nfa(nfa1: "NFA", nfa2: "NFA") -> "NFA":
-        nfa = NFA()
-        offset1, offset2 = 1, max(nfa1.states) + 2
-        new_start = 0
-        nfa.states = (
-            [new_start]
-            + [state + offset1 for state in nfa1.states]
-            + [state + offset2 for state in nfa2.states]
-        )
-        nfa.start_state = new_start
-        nfa.accept_states = [state + offset1 for state in nfa1.accept_states] + [
-            state + offset2 for state in nfa2.accept_states
-        ]
-        nfa.alphabet = nfa1.alphabet.union(nfa2.alphabet)
-        nfa.transitions = {
-            **{
-                state
-                + offset1: {
-                    a: [s + offset1 for s in next_states]
-                    for a, next_states in transitions.items()
-                }
-                for state, transitions in nfa1.transitions.items()
-            },
-            **{
-                state
-                + offset2: {
-                    a: [s + offset2 for s in next_states]
-                    for a, next_states in transitions.items()
-                }
-                for state, transitions in nfa2.transitions.items()
-            },
-        }
-        nfa.transitions[new_start] = {a: [] for a in nfa.alphabet}
-        nfa.transitions[new_start][""] = [
-            nfa1.start_state + offset1,
-            nfa2.start_state + offset2,
-        ]
+        first, last = first_last_stack.pop()
+        follow[0] = first
+
+        nfa = cls()
+        nfa.states = list(range(len(position_symbols)))
+        nfa.alphabet = alphabet
+        nfa.start_state = 0
+        nfa.accept_states = sorted(last | {0}) if ast.nullable else sorted(last)
+        nfa.transitions = {state: {} for state in nfa.states}
+        for state, next_positions in enumerate(follow):
+            for position in sorted(next_positions):
+                for symbol in position_symbols[position]:
+                    nfa.transitions[state].setdefault(symbol, []).append(position)
         return nfa
 
     @staticmethod
-    def _kleene_star_nfa(nfa1: "NFA") -> "NFA":
-        nfa = NFA()
-        offset = 1
-        new_start, new_final = 0, max(nfa1.states) + offset + 1
-        nfa.states = (
-            [new_start] + [state + offset for state in nfa1.states] + [new_final]
-        )
-        nfa.start_state = new_start
-        nfa.accept_states = [new_start, new_final]
-        nfa.alphabet = nfa1.alphabet
-        nfa.transitions = {
-            state
-            + offset: {
-                a: [s + offset for s in next_states]
-                for a, next_states in transitions.items()
-            }
-            for state, transitions in nfa1.transitions.items()
-        }
-        nfa.transitions[new_start] = {a: [] for a in nfa.alphabet}
-        nfa.transitions[new_final] = {a: [] for a in nfa.alphabet}
-        nfa.transitions[new_start][""] = [nfa1.start_state + offset, new_final]
-        for final_state in nfa1.accept_states:
-            nfa.transitions.setdefault(final_state + offset, {}).setdefault(
-                "", []
-            ).extend([nfa1.start_state + offset, new_final])
-        return nfa
+    def _glushkov_concat(
+        node: Concat,
+        operands: list[tuple[set[int], set[int]]],
+        follow: list[set[int]],
+    ) -> tuple[set[int], set[int]]:
+        first, last = operands[0]
+        first, last = set(first), set(last)
+        prefix_nullable = node.items[0].nullable
+        for item, (item_first, item_last) in zip(node.items[1:], operands[1:]):
+            for position in last:
+                follow[position] |= item_first
+            if prefix_nullable:
+                first |= item_first
+            last = last | item_last if item.nullable else set(item_last)
+            prefix_nullable = prefix_nullable and item.nullable
+        return first, last
 
     def remove_epsilon_transitions(self) -> "NFA":
         new_nfa = NFA()
@@ -189,21 +183,16 @@ class NFA(FiniteAutomaton):
         new_nfa.accept_states = list(new_accept_states)
         return new_nfa
 
-    def _compute_epsilon_closure(self) -> dict[int, set[int]]:
-        epsilon_closure = {state: {state} for state in self.states}
-
-        for state in self.states:
-            stack = list(self.transitions.get(state, {}).get("", []))
-            while stack:
-                current = stack.pop()
-                if current not in epsilon_closure[state]:
-                    epsilon_closure[state].add(current)
-                    stack.extend(self.transitions.get(current, {}).get("", []))
-
-        return epsilon_closure
+    def _compute_epsilon_closure(self) -> dict[int, frozenset[int]]:
+        return epsilon_closures(self.states, self.transitions)
 
     def simulate(self, input_str: str) -> bool:
-        current_states = self._epsilon_closure({self.start_state})
+        if self._has_epsilon_transitions():
+            closure = self._epsilon_closure
+        else:
+            closure = set
+
+        current_states = closure({self.start_state})
 
         for symbol in input_str:
             if symbol not in self.alphabet:
@@ -211,10 +200,53 @@ class NFA(FiniteAutomaton):
             next_states = set()
             for state in current_states:
                 next_states.update(self.transitions.get(state, {}).get(symbol, []))
-            current_states = self._epsilon_closure(next_states)
+            current_states = closure(next_states)
 
         return bool(current_states.intersection(self.accept_states))
 
+    def to_bitset(self) -> BitsetNFA:
+        """
+        Precompiles the NFA for repeated simulation: state sets become int
+        bitmasks and epsilon closures are resolved ahead of time.
+        """
+        return BitsetNFA(self)
+
+    def stepper(self) -> BitsetNFA:
+        return self.to_bitset()
+
+    def lazy_dfa(
+        self, max_states: int = 10000, max_bytes: int = 8 * 1024 * 1024
+    ) -> LazyDFA:
+        """
+        Returns a matcher that determinizes on the fly and caches at most
+        max_states DFA states (about max_bytes of memory).
+        """
+        return LazyDFA(self, max_states, max_bytes)
+
+    def is_empty(self) -> CheckResult:
+        """Holds when no word is accepted; otherwise gives a shortest accepted one."""
+        return check_emptiness(self.to_bitset())
+
+    def is_universal(self, alphabet: set[str] | None = None) -> CheckResult:
+        """
+        Holds when every word over alphabet (by default the NFA's own) is
+        accepted; otherwise gives a shortest rejected word.
+        """
+        if alphabet is None:
+            alphabet = self.alphabet
+        return check_universality(self.to_bitset(), set(alphabet) - {""})
+
+    def is_subset_of(self, other: "NFA") -> CheckResult:
+        """
+        Holds when L(self) ⊆ L(other); otherwise gives a shortest word
+        accepted by self and rejected by other. other is never determinized
+        in full: the check prunes state sets with an antichain.
+        """
+        return check_inclusion(self.to_bitset(), other.to_bitset())
+
+    def _has_epsilon_transitions(self) -> bool:
+        return any(transitions.get("") for transitions in self.transitions.values())
+
     def _epsilon_closure(self, states: set[int]) -> set[int]:
         closure = set(states)
         stack = list(states)
@@ -227,64 +259,93 @@ class NFA(FiniteAutomaton):
         return closure
 
     def remove_useless_vertices(self) -> "NFA":
-        new_nfa = self.remove_epsilon_transitions() if "" in self.alphabet else NFA()
-        new_nfa.states = self.states.copy()
+        useful = useful_states(self.start_state, self.accept_states, self.transitions)
+
+        new_nfa = NFA()
+        new_nfa.states = [state for state in self.states if state in useful]
         new_nfa.start_state = self.start_state
         new_nfa.alphabet = self.alphabet.copy()
-        new_nfa.accept_states = self.accept_states.copy()
-        new_nfa.transitions = {
-            state: transitions.copy() for state, transitions in self.transitions.items()
-        }
-
-        useful_states = new_nfa._get_reachable_states().intersection(
-            new_nfa._get_productive_states()
-        )
-
-        new_nfa.states = list(useful_states)
         new_nfa.accept_states = [
-            state for state in new_nfa.accept_states if state in useful_states
+            state for state in self.accept_states if state in useful
         ]
         new_nfa.transitions = {
             state: {
-                symbol: [s for s in next_states if s in useful_states]
+                symbol: [s for s in next_states if s in useful]
                 for symbol, next_states in transitions.items()
-                if any(s in useful_states for s in next_states)
+                if any(s in useful for s in next_states)
             }
-            for state, transitions in new_nfa.transitions.items()
-            if state in useful_states
+            for state, transitions in self.transitions.items()
+            if state in useful
         }
 
         return new_nfa
 
-    def _get_reachable_states(self):
-        reachable = set()
-        stack = [self.start_state]
+    def reduce(self) -> "NFA":
+        """
+        Returns a smaller NFA for the same language, without epsilon
+        transitions: useless states are removed, then forward and backward
+        bisimilar states are merged until the size stops changing. Merged
+        states keep the smallest original number.
+        """
+        nfa = (
+            self.remove_epsilon_transitions()
+            if self._has_epsilon_transitions()
+            else self
+        )
+        nfa = nfa.remove_useless_vertices()
+        while True:
+            num_states = len(nfa.states)
+            nfa = nfa._quotient(
+                bisimulation_classes(nfa.states, nfa.accept_states, nfa.transitions)
+            )
+            nfa = nfa._quotient(
+                bisimulation_classes(
+                    nfa.states, [nfa.start_state], reverse_transitions(nfa.transitions)
+                )
+            )
+            if len(nfa.states) == num_states:
+                return nfa
 
-        while stack:
-            state = stack.pop()
-            if state not in reachable:
-                reachable.add(state)
-                for next_states in self.transitions.get(state, {}).values():
-                    stack.extend(next_states)
-
-        return reachable
-
-    def _get_productive_states(self):
-        productive = set(self.accept_states)
-        changed = True
-
-        while changed:
-            changed = False
-            for state in self.states:
-                if state not in productive:
-                    if any(
-                        any(s in productive for s in next_states)
-                        for next_states in self.transitions.get(state, {}).values()
-                    ):
-                        productive.add(state)
-                        changed = True
-
-        return productive
+    def _quotient(self, classes: dict[int, int]) -> "NFA":
+        new_nfa = NFA()
+        new_nfa.start_state = classes.get(self.start_state, self.start_state)
+        new_nfa.states = sorted(
+            {classes.get(state, state) for state in self.states} | {new_nfa.start_state}
+        )
+        new_nfa.alphabet = self.alphabet.copy()
+        new_nfa.accept_states = sorted({classes[state] for state in self.accept_states})
+
+        transitions: dict[int, dict[str, set[int]]] = {}
+        for state, row in self.transitions.items():
+            new_row = transitions.setdefault(classes[state], {})
+            for symbol, next_states in row.items():
+                if next_states:
+                    new_row.setdefault(symbol, set()).update(
+                        classes[next_state] for next_state in next_states
+                    )
+        new_nfa.transitions = {
+            state: {symbol: sorted(targets) for symbol, targets in row.items()}
+            for state, row in transitions.items()
+        }
+        return new_nfa
+
+    def _get_reachable_states(self) -> set[int]:
+        return reachable_states(self.start_state, self.transitions)
+
+    def _get_productive_states(self) -> set[int]:
+        return productive_states(self.accept_states, self.transitions)
+
+    @classmethod
+    def from_compact(cls, compact: CompactAutomaton) -> "NFA":
+        nfa = cls()
+        nfa.states = list(compact.state_labels)
+        nfa.start_state = compact.state_labels[compact.start_state]
+        nfa.accept_states = compact.accept_states
+        nfa.transitions = compact.to_transitions()
+        nfa.alphabet = set(compact.symbols[1:])
+        if 0 in compact.edge_symbols:
+            nfa.alphabet.add("")
+        return nfa
 
     @classmethod
     def from_string(cls, input_str: str) -> "NFA":
@@ -348,73 +409,80 @@ class NFA(FiniteAutomaton):
 
         return "\n".join(output)
 
-    def to_regex(self) -> str:
-        nfa = copy.deepcopy(self)
-
-        regex_transitions = {state: {} for state in nfa.states}
-        for state in nfa.states:
-            for symbol, next_states in nfa.transitions.get(state, {}).items():
+    def to_regex(self, strategy: str = "order") -> str:
+        """
+        Builds a regular expression by state elimination. strategy picks
+        the elimination order: "order", "degree", "weight" or "dynamic"
+        (see src/state_elimination.py).
+        """
+        regex_transitions = {state: {} for state in self.states}
+        for state in self.states:
+            for symbol, next_states in self.transitions.get(state, {}).items():
                 for next_state in next_states:
                     regex_transitions[state].setdefault(next_state, set()).add(
                         "ε" if symbol == "" else symbol
                     )
 
-        new_start_state = max(nfa.states) + 1
-        nfa.states.append(new_start_state)
-        regex_transitions[new_start_state] = {nfa.start_state: {"ε"}}
-        nfa.start_state = new_start_state
-
-        new_accept_state = max(nfa.states) + 1
-        nfa.states.append(new_accept_state)
-        for accept_state in nfa.accept_states:
+        new_start_state = max(self.states) + 1
+        new_accept_state = new_start_state + 1
+        regex_transitions[new_start_state] = {self.start_state: {"ε"}}
+        for accept_state in self.accept_states:
             regex_transitions[accept_state].setdefault(new_accept_state, set()).add("ε")
-        nfa.accept_states = [new_accept_state]
-
-        states_to_eliminate = [
-            state
-            for state in nfa.states
-            if state not in (nfa.start_state, nfa.accept_states[0])
-        ]
-
-        while states_to_eliminate:
-            state_to_remove = states_to_eliminate.pop(0)
-
-            incoming = {
-                src: regex_transitions[src][state_to_remove]
-                for src in regex_transitions
-                if state_to_remove in regex_transitions[src]
-            }
-            outgoing = regex_transitions[state_to_remove]
-            self_loop = regex_transitions[state_to_remove].get(state_to_remove, set())
-
-            R_jj_star = f"({'|'.join(sorted(self_loop))})*" if self_loop else "ε"
-
-            for src in incoming:
-                for dst in outgoing:
-                    new_regexes = set()
-                    for R_ij in incoming[src]:
-                        for R_jk in outgoing[dst]:
-                            new_regex = NFA._combine_regexes(R_ij, R_jj_star, R_jk)
-                            new_regexes.add(new_regex)
-
-                    regex_transitions[src].setdefault(dst, set()).update(new_regexes)
-
-            for src in list(regex_transitions.keys()):
-                regex_transitions[src].pop(state_to_remove, None)
-            regex_transitions.pop(state_to_remove, None)
-
-        start, accept = nfa.start_state, nfa.accept_states[0]
-        final_regexes = regex_transitions.get(start, {}).get(accept, set())
-        res = "|".join(sorted(final_regexes)) if final_regexes else "∅"
 
+        res = eliminate_states(
+            regex_transitions, new_start_state, new_accept_state, strategy
+        )
         return RegularExpression(res.replace("ε", "")).fix()
 
-    @staticmethod
-    def _combine_regexes(R_ij, R_jj_star, R_jk):
-        parts = []
-        for part in (R_ij, R_jj_star, R_jk):
-            if part not in ("", "ε"):
-                if "|" in part or "*" in part:
-                    part = f"({part})"
-                parts.append(part)
-        return "".join(parts) or "ε"
+
+class _ThompsonBuilder:
+    """
+    Builds a Thompson NFA in place: states come from one shared counter and
+    edges are appended to a single transition table, so every operator
+    costs time proportional to its arity. A fragment is a
+    (start state, accept state) pair.
+    """
+
+    def __init__(self):
+        self.transitions: dict[int, dict[str, list[int]]] = {}
+
+    def _new_state(self) -> int:
+        state = len(self.transitions)
+        self.transitions[state] = {}
+        return state
+
+    def _add_edge(self, state: int, symbol: str, next_state: int) -> None:
+        self.transitions[state].setdefault(symbol, []).append(next_state)
+
+    def symbols(self, characters) -> tuple[int, int]:
+        start, accept = self._new_state(), self._new_state()
+        for character in characters:
+            self._add_edge(start, character, accept)
+        return start, accept
+
+    def epsilon(self) -> tuple[int, int]:
+        return self.symbols(("",))
+
+    def empty(self) -> tuple[int, int]:
+        return self.symbols(())
+
+    def concat(self, fragments: list[tuple[int, int]]) -> tuple[int, int]:
+        for (_, accept), (start, _) in zip(fragments, fragments[1:]):
+            self._add_edge(accept, "", start)
+        return fragments[0][0], fragments[-1][1]
+
+    def union(self, fragments: list[tuple[int, int]]) -> tuple[int, int]:
+        start, accept = self._new_state(), self._new_state()
+        for fragment_start, fragment_accept in fragments:
+            self._add_edge(start, "", fragment_start)
+            self._add_edge(fragment_accept, "", accept)
+        return start, accept
+
+    def star(self, fragment: tuple[int, int]) -> tuple[int, int]:
+        start, accept = self._new_state(), self._new_state()
+        fragment_start, fragment_accept = fragment
+        self._add_edge(start, "", fragment_start)
+        self._add_edge(start, "", accept)
+        self._add_edge(fragment_accept, "", fragment_start)
+        self._add_edge(fragment_accept, "", accept)
+        return start, accept
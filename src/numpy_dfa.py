@@ -0,0 +1,96 @@
+from typing import TYPE_CHECKING, Iterable
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if TYPE_CHECKING:
+    from src.dfa import DFA
+
+
+class DenseDFA:
+    """
+    DFA compiled into NumPy arrays for vectorized batch simulation.
+
+    table[state, symbol_id] is an int32 transition table over single-character
+    symbols, symbol_lookup maps code points to symbol ids. Row dead_state is
+    a sentinel that only loops to itself; missing transitions and the
+    unknown_symbol column lead there. The pad_symbol
+    column leaves every state unchanged, so words of different lengths can
+    be advanced together as rows of one padded matrix.
+    """
+
+    def __init__(self, dfa: "DFA"):
+        if np is None:
+            raise ImportError("NumPy is required for DenseDFA")
+
+        states = [dfa.start_state, *dfa.states]
+        for state, transitions in dfa.transitions.items():
+            states.append(state)
+            states.extend(transitions.values())
+        self.states = list(dict.fromkeys(states))
+        index = {state: i for i, state in enumerate(self.states)}
+
+        self.symbols = tuple(sorted(s for s in dfa.alphabet if len(s) == 1))
+        self.unknown_symbol = len(self.symbols)
+        self.pad_symbol = len(self.symbols) + 1
+        max_codepoint = max(map(ord, self.symbols), default=-1)
+        self.symbol_lookup = np.full(
+            max_codepoint + 2, self.unknown_symbol, dtype=np.int32
+        )
+        for symbol_id, symbol in enumerate(self.symbols):
+            self.symbol_lookup[ord(symbol)] = symbol_id
+        self.dead_state = len(self.states)
+        self.start_state = index[dfa.start_state]
+
+        self.table = np.full(
+            (len(self.states) + 1, len(self.symbols) + 2),
+            self.dead_state,
+            dtype=np.int32,
+        )
+        self.table[:, self.pad_symbol] = np.arange(len(self.states) + 1)
+        for state, transitions in dfa.transitions.items():
+            for symbol_id, symbol in enumerate(self.symbols):
+                next_state = transitions.get(symbol)
+                if next_state is not None:
+                    self.table[index[state], symbol_id] = index[next_state]
+
+        self.accept = np.zeros(len(self.states) + 1, dtype=bool)
+        self.accept[[index[state] for state in dfa.accept_states]] = True
+
+    def encode(self, words: Iterable[str]) -> "np.ndarray":
+        """
+        Converts words into an int32 matrix of symbol ids, one row per word,
+        padded on the right with pad_symbol.
+        """
+        words = list(words)
+        lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+        width = int(lengths.max(initial=0))
+        text = "".join(words).encode("utf-32-le")
+        codepoints = np.frombuffer(text, dtype=np.uint32)
+
+        codepoints = np.minimum(codepoints, len(self.symbol_lookup) - 1)
+        symbol_ids = self.symbol_lookup[codepoints]
+        if len(symbol_ids) == len(words) * width:
+            return symbol_ids.reshape(len(words), width)
+
+        matrix = np.full((len(words), width), self.pad_symbol, dtype=np.int32)
+        matrix[np.arange(width) < lengths[:, None]] = symbol_ids
+        return matrix
+
+    def run(self, matrix: "np.ndarray") -> "np.ndarray":
+        """Advances all rows of an encoded matrix in lockstep, returns end states."""
+        table = self.table.ravel()
+        width = self.table.shape[1]
+        states = np.full(len(matrix), self.start_state, dtype=np.int32)
+        for column in np.ascontiguousarray(matrix.T):
+            states = table.take(states * width + column)
+        return states
+
+    def simulate_many(self, words: Iterable[str]) -> "np.ndarray":
+        """Boolean acceptance vector for words, in input order."""
+        return self.accept[self.run(self.encode(words))]
+
+    def simulate(self, input_str: str) -> bool:
+        return bool(self.simulate_many([input_str])[0])
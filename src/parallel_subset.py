@@ -0,0 +1,87 @@
+from multiprocessing import Pool
+from typing import TYPE_CHECKING
+from src.bitset_nfa import BitsetNFA
+from src.compact import CompactAutomaton
+
+if TYPE_CHECKING:
+    from src.nfa import NFA
+
+_worker_bitset: BitsetNFA | None = None
+
+
+def parallel_subset_construction(
+    nfa: "NFA | CompactAutomaton",
+    processes: int | None = None,
+    chunksize: int = 256,
+) -> tuple[list[dict[str, int]], list[int]]:
+    """
+    Subset construction with frontier levels expanded on a process pool.
+
+    The BFS proceeds level by level: each worker steps a batch of frontier
+    masks over all symbols, and the parent merges the results in frontier
+    and symbol order, so states get exactly the numbers of the sequential
+    bitset construction. Frontiers smaller than one batch are expanded in
+    the parent. Returns the transitions of every DFA state and the
+    accepting state ids.
+    """
+    bitset = BitsetNFA(nfa)
+    symbols = sorted(bitset.alphabet)
+    masks = [bitset.start_state]
+    mask_ids = {bitset.start_state: 0}
+    transitions: list[dict[str, int]] = []
+    accept_states: list[int] = []
+
+    pool = Pool(processes, _init_worker, (nfa,)) if processes != 1 else None
+    try:
+        frontier_start = 0
+        while frontier_start < len(masks):
+            frontier = masks[frontier_start:]
+            if pool is None or len(frontier) <= chunksize:
+                expanded = _expand_masks(bitset, symbols, frontier)
+            else:
+                batches = [
+                    frontier[i : i + chunksize]
+                    for i in range(0, len(frontier), chunksize)
+                ]
+                expanded = [
+                    item for batch in pool.map(_expand, batches) for item in batch
+                ]
+
+            for accepting, next_masks in expanded:
+                state = len(transitions)
+                row = {}
+                for symbol, next_mask in zip(symbols, next_masks):
+                    if not next_mask:
+                        continue
+                    next_state = mask_ids.get(next_mask)
+                    if next_state is None:
+                        next_state = mask_ids[next_mask] = len(masks)
+                        masks.append(next_mask)
+                    row[symbol] = next_state
+                transitions.append(row)
+                if accepting:
+                    accept_states.append(state)
+            frontier_start += len(frontier)
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    return transitions, accept_states
+
+
+def _init_worker(nfa: "NFA | CompactAutomaton") -> None:
+    global _worker_bitset
+    _worker_bitset = BitsetNFA(nfa)
+
+
+def _expand(masks: list[int]) -> list[tuple[bool, list[int]]]:
+    return _expand_masks(_worker_bitset, sorted(_worker_bitset.alphabet), masks)
+
+
+def _expand_masks(
+    bitset: BitsetNFA, symbols: list[str], masks: list[int]
+) -> list[tuple[bool, list[int]]]:
+    return [
+        (bool(mask & bitset.accept_mask), bitset.successor_masks(mask, symbols))
+        for mask in masks
+    ]
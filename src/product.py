@@ -0,0 +1,186 @@
+from collections import deque
+from typing import TYPE_CHECKING, Iterable, Iterator
+from src.decision import CheckResult
+from src.matcher import StreamMatcher, simulate_many
+
+if TYPE_CHECKING:
+    from src.dfa import DFA
+
+
+class BooleanOperations:
+    """Lazy Boolean operations shared by automata and products."""
+
+    def intersection(self, other) -> "ProductAutomaton":
+        return ProductAutomaton(self, other, "intersection")
+
+    def union(self, other) -> "ProductAutomaton":
+        return ProductAutomaton(self, other, "union")
+
+    def difference(self, other) -> "ProductAutomaton":
+        return ProductAutomaton(self, other, "difference")
+
+    def symmetric_difference(self, other) -> "ProductAutomaton":
+        return ProductAutomaton(self, other, "symmetric_difference")
+
+
+class ProductAutomaton(BooleanOperations):
+    """
+    Lazily explored product of two automata under a Boolean operation.
+
+    The operands may be NFAs, DFAs or other products, each one driven
+    through its stepper. A product state is a pair of operand states and is
+    numbered and stored only the first time the input, an emptiness check
+    or materialize() reaches it; its transitions are cached the same way.
+    """
+
+    OPERATIONS = {
+        "intersection": (
+            lambda left, right: left and right,
+            lambda left, right: left or right,
+        ),
+        "union": (
+            lambda left, right: left or right,
+            lambda left, right: left and right,
+        ),
+        "difference": (
+            lambda left, right: left and not right,
+            lambda left, right: left,
+        ),
+        "symmetric_difference": (
+            lambda left, right: left != right,
+            lambda left, right: left and right,
+        ),
+    }
+
+    def __init__(self, left, right, operation: str):
+        if operation not in self.OPERATIONS:
+            raise ValueError(f"Unknown operation: {operation}")
+        self.operation = operation
+        self._accepts, self._dies = self.OPERATIONS[operation]
+        self.left = left.stepper()
+        self.right = right.stepper()
+        self.alphabet = (left.alphabet | right.alphabet) - {""}
+
+        self.states: list[tuple] = []
+        self._state_ids: dict[tuple, int] = {}
+        self._accepting: list[bool] = []
+        self._dead: list[bool] = []
+        self._transitions: list[dict[str, int]] = []
+        self.start_state = self._get_state(
+            (self.left.start_state, self.right.start_state)
+        )
+
+    def stepper(self) -> "ProductAutomaton":
+        return self
+
+    def step(self, state: int, symbol: str) -> int:
+        next_state = self._transitions[state].get(symbol)
+        if next_state is None:
+            left_state, right_state = self.states[state]
+            next_state = self._get_state(
+                (
+                    self.left.step(left_state, symbol),
+                    self.right.step(right_state, symbol),
+                )
+            )
+            self._transitions[state][symbol] = next_state
+        return next_state
+
+    def is_accepting(self, state: int) -> bool:
+        return self._accepting[state]
+
+    def is_dead(self, state: int) -> bool:
+        return self._dead[state]
+
+    def _get_state(self, pair: tuple) -> int:
+        state = self._state_ids.get(pair)
+        if state is None:
+            state = len(self.states)
+            self._state_ids[pair] = state
+            self.states.append(pair)
+            left_state, right_state = pair
+            self._accepting.append(
+                self._accepts(
+                    self.left.is_accepting(left_state),
+                    self.right.is_accepting(right_state),
+                )
+            )
+            self._dead.append(
+                self._dies(
+                    self.left.is_dead(left_state), self.right.is_dead(right_state)
+                )
+            )
+            self._transitions.append({})
+        return state
+
+    def simulate(self, input_str: str) -> bool:
+        state = self.start_state
+        for symbol in input_str:
+            state = self.step(state, symbol)
+            if self._dead[state]:
+                return False
+        return self._accepting[state]
+
+    def simulate_many(self, words: Iterable[str]) -> list[bool] | Iterator[bool]:
+        return simulate_many(self, words)
+
+    def matcher(self) -> StreamMatcher:
+        return StreamMatcher(self)
+
+    def _explore(
+        self, parents: dict[int, tuple[int, str]] | None = None
+    ) -> Iterator[int]:
+        """
+        Yields live product states in BFS order, creating them on the way.
+        parents, when given, receives the BFS tree edge into every state.
+        """
+        symbols = sorted(self.alphabet)
+        visited = {self.start_state}
+        queue = deque([self.start_state])
+        while queue:
+            state = queue.popleft()
+            yield state
+            for symbol in symbols:
+                next_state = self.step(state, symbol)
+                if next_state not in visited and not self._dead[next_state]:
+                    visited.add(next_state)
+                    queue.append(next_state)
+                    if parents is not None:
+                        parents[next_state] = (state, symbol)
+
+    def is_empty(self) -> CheckResult:
+        """
+        Explores the product only until the first accepting state; when the
+        language is not empty, the counterexample is a shortest accepted word.
+        """
+        parents: dict[int, tuple[int, str]] = {}
+        for state in self._explore(parents):
+            if self._accepting[state]:
+                symbols = []
+                while state != self.start_state:
+                    state, symbol = parents[state]
+                    symbols.append(symbol)
+                return CheckResult(False, "".join(reversed(symbols)))
+        return CheckResult(True)
+
+    def materialize(self) -> "DFA":
+        """Builds the reachable live part of the product as a partial DFA."""
+        from src.dfa import DFA
+
+        numbering = {state: i for i, state in enumerate(self._explore())}
+        dfa = DFA()
+        dfa.states = list(numbering.values())
+        dfa.alphabet = set(self.alphabet)
+        dfa.start_state = numbering[self.start_state]
+        dfa.accept_states = [
+            i for state, i in numbering.items() if self._accepting[state]
+        ]
+        dfa.transitions = {
+            i: {
+                symbol: numbering[next_state]
+                for symbol, next_state in self._transitions[state].items()
+                if next_state in numbering
+            }
+            for state, i in numbering.items()
+        }
+        return dfa
@@ -0,0 +1,87 @@
+from typing import Iterable
+from src.graph_analysis import _all_states, _targets
+
+
+def bisimulation_classes(
+    states: Iterable[int], marked_states: Iterable[int], transitions: dict
+) -> dict[int, int]:
+    """
+    Coarsest bisimulation by partition refinement.
+
+    Starts from the split into marked and unmarked states. The signature of
+    a state is its set of (symbol, successor block) pairs, and every block
+    keeps the signature all its members share. When states move to a new
+    block only their predecessors can change signature, so only those are
+    recomputed, and only the blocks holding them are split; members that
+    keep the block's signature stay in place. Returns the smallest state
+    of each block for every state. With accept states and forward
+    transitions this merges states with equal right languages, with the
+    start state and reversed transitions it merges states with equal left
+    languages.
+    """
+    states = _all_states(states, transitions)
+    marked_states = set(marked_states)
+    edges: dict[int, list[tuple[str, int]]] = {state: [] for state in states}
+    predecessors: dict[int, list[int]] = {state: [] for state in states}
+    for state in states:
+        for symbol, next_states in transitions.get(state, {}).items():
+            for next_state in _targets(next_states):
+                edges[state].append((symbol, next_state))
+                predecessors[next_state].append(state)
+
+    block: dict[int, int] = {}
+    members: list[set[int]] = []
+    for part in (
+        [state for state in states if state in marked_states],
+        [state for state in states if state not in marked_states],
+    ):
+        if part:
+            block.update(dict.fromkeys(part, len(members)))
+            members.append(set(part))
+    block_signatures: list[frozenset | None] = [None] * len(members)
+
+    touched: dict[int, set[int]] = {
+        block_id: set(block_members) for block_id, block_members in enumerate(members)
+    }
+    while touched:
+        block_id, touched_states = touched.popitem()
+        old_signature = block_signatures[block_id]
+        groups: dict[frozenset, list[int]] = {}
+        for state in touched_states:
+            signature = frozenset((symbol, block[t]) for symbol, t in edges[state])
+            groups.setdefault(signature, []).append(state)
+
+        if len(members[block_id]) > len(touched_states):
+            staying = old_signature
+        else:
+            staying = max(groups, key=lambda signature: len(groups[signature]))
+        block_signatures[block_id] = staying
+
+        moved = []
+        for signature, group in groups.items():
+            if signature == staying:
+                continue
+            new_block_id = len(members)
+            members[block_id].difference_update(group)
+            members.append(set(group))
+            block_signatures.append(signature)
+            for state in group:
+                block[state] = new_block_id
+            moved.extend(group)
+        for state in moved:
+            for previous_state in predecessors[state]:
+                touched.setdefault(block[previous_state], set()).add(previous_state)
+
+    representatives = [min(block_members) for block_members in members]
+    return {state: representatives[block[state]] for state in states}
+
+
+def reverse_transitions(transitions: dict) -> dict[int, dict[str, list[int]]]:
+    reversed_transitions: dict[int, dict[str, list[int]]] = {}
+    for state, row in transitions.items():
+        for symbol, next_states in row.items():
+            for next_state in _targets(next_states):
+                reversed_transitions.setdefault(next_state, {}).setdefault(
+                    symbol, []
+                ).append(state)
+    return reversed_transitions
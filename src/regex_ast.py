@@ -0,0 +1,468 @@
+import weakref
+from typing import Iterator
+
+
+class Node:
+    """
+    Immutable regex syntax tree node.
+
+    Nodes are hash-consed: constructing a node whose fields equal those of
+    a live node returns that node, so structurally equal trees are the
+    same object and equality is identity. The hash is computed once on
+    construction.
+    """
+
+    __slots__ = ("nullable", "_hash", "__weakref__")
+
+    children: tuple["Node", ...] = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    @classmethod
+    def _make(cls, nullable: bool, *fields) -> "Node":
+        key = (cls, *fields)
+        node = _nodes.get(key)
+        if node is None:
+            node = object.__new__(cls)
+            for name, value in zip(cls.__slots__, fields):
+                object.__setattr__(node, name, value)
+            object.__setattr__(node, "nullable", nullable)
+            object.__setattr__(node, "_hash", hash(key))
+            _nodes[key] = node
+        return node
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        return self is other
+
+    def _fields(self) -> tuple:
+        return ()
+
+    def __reduce__(self):
+        return self.__class__, self._fields()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}{self._fields()!r}"
+
+
+_nodes: "weakref.WeakValueDictionary[tuple, Node]" = weakref.WeakValueDictionary()
+
+
+class Empty(Node):
+    """The empty language."""
+
+    __slots__ = ()
+
+    def __new__(cls):
+        return cls._make(False)
+
+
+class Epsilon(Node):
+    """The language containing only the empty word."""
+
+    __slots__ = ()
+
+    def __new__(cls):
+        return cls._make(True)
+
+
+class Symbol(Node):
+    __slots__ = ("char",)
+
+    def __new__(cls, char: str):
+        return cls._make(False, char)
+
+    def _fields(self) -> tuple:
+        return (self.char,)
+
+
+class Concat(Node):
+    __slots__ = ("items",)
+
+    def __new__(cls, items: tuple[Node, ...]):
+        return cls._make(all(item.nullable for item in items), items)
+
+    @property
+    def children(self) -> tuple[Node, ...]:
+        return self.items
+
+    def _fields(self) -> tuple:
+        return (self.items,)
+
+
+class Union(Node):
+    __slots__ = ("items",)
+
+    def __new__(cls, items: tuple[Node, ...]):
+        return cls._make(any(item.nullable for item in items), items)
+
+    @property
+    def children(self) -> tuple[Node, ...]:
+        return self.items
+
+    def _fields(self) -> tuple:
+        return (self.items,)
+
+
+class Star(Node):
+    __slots__ = ("item",)
+
+    def __new__(cls, item: Node):
+        return cls._make(True, item)
+
+    @property
+    def children(self) -> tuple[Node, ...]:
+        return (self.item,)
+
+    def _fields(self) -> tuple:
+        return (self.item,)
+
+
+class Repeat(Node):
+    """Counted repetition item{min,max}, max is None when unbounded."""
+
+    __slots__ = ("item", "min", "max")
+
+    def __new__(cls, item: Node, min_count: int, max_count: int | None):
+        return cls._make(min_count == 0 or item.nullable, item, min_count, max_count)
+
+    @property
+    def children(self) -> tuple[Node, ...]:
+        return (self.item,)
+
+    def _fields(self) -> tuple:
+        return (self.item, self.min, self.max)
+
+
+class CharClass(Node):
+    """Bracket class: matches any single character of chars."""
+
+    __slots__ = ("chars",)
+
+    def __new__(cls, chars: frozenset[str]):
+        return cls._make(False, chars)
+
+    def _fields(self) -> tuple:
+        return (self.chars,)
+
+
+EMPTY = Empty()
+EPSILON = Epsilon()
+
+# Largest count accepted in r{n,m}, counted repetitions are expanded into
+# that many copies of r when automata are built.
+MAX_REPEAT = 1000
+# Largest number of nodes a tree may have once nested counted repetitions
+# are expanded, e.g. ((a{100}){100}){100} has about 10^6.
+MAX_EXPANDED_SIZE = 100_000
+
+
+def parse(reg_exp: str) -> Node:
+    """
+    Parses a regular expression in a single left-to-right pass.
+
+    Concatenation is implicit (an explicit "." is accepted and ignored),
+    an empty alternative or group stands for the empty word and "∅" for
+    the empty language. Postfix quantifiers are "*", "?", "{n}", "{n,}"
+    and "{n,m}" ("{1,}" is one-or-more, "+" already means "|") with counts
+    up to MAX_REPEAT, "[a-z0]" is a character class.
+    """
+    alternatives: list[Node] = []
+    current: list[Node] = []
+    groups: list[tuple[list[Node], list[Node]]] = []
+    previous_quantifier = None
+    index = 0
+
+    while index < len(reg_exp):
+        current_char = reg_exp[index]
+        index += 1
+        quantifier = None
+
+        if current_char == "(":
+            groups.append((alternatives, current))
+            alternatives, current = [], []
+        elif current_char == ")":
+            if not groups:
+                raise ValueError(
+                    "Invalid regular expression: Unmatched closing parenthesis"
+                )
+            group = _build_union(alternatives, current)
+            alternatives, current = groups.pop()
+            current.append(group)
+        elif current_char == "|":
+            alternatives.append(_build_concat(current))
+            current = []
+        elif current_char in "*?{":
+            if current_char == "{":
+                end = reg_exp.find("}", index)
+                if end == -1:
+                    raise ValueError("Invalid regular expression: Unmatched brace")
+                min_count, max_count = _parse_bounds(reg_exp[index:end])
+                index = end + 1
+            else:
+                min_count, max_count = (0, None) if current_char == "*" else (0, 1)
+            if previous_quantifier == current_char == "*":
+                raise ValueError("Invalid regular expression: Consecutive asterisks")
+            if previous_quantifier:
+                raise ValueError("Invalid regular expression: Consecutive quantifiers")
+            if not current:
+                raise ValueError(
+                    f"Invalid regular expression: Misplaced quantifier '{current_char}'"
+                )
+            if current_char == "*":
+                current[-1] = Star(current[-1])
+            else:
+                current[-1] = Repeat(current[-1], min_count, max_count)
+            quantifier = current_char
+        elif current_char == "[":
+            end = reg_exp.find("]", index)
+            if end == -1:
+                raise ValueError("Invalid regular expression: Unmatched bracket")
+            current.append(_parse_class(reg_exp[index:end]))
+            index = end + 1
+        elif current_char in "}]":
+            raise ValueError(
+                f"Invalid regular expression: Unmatched closing '{current_char}'"
+            )
+        elif current_char == "∅":
+            current.append(EMPTY)
+        elif current_char != ".":
+            current.append(Symbol(current_char))
+        previous_quantifier = quantifier
+
+    if groups:
+        raise ValueError("Invalid regular expression: Unmatched opening parenthesis")
+
+    return _build_union(alternatives, current)
+
+
+def _parse_bounds(body: str) -> tuple[int, int | None]:
+    min_text, comma, max_text = body.partition(",")
+    bounds = [text for text in (min_text, max_text) if text]
+    if not bounds or not all(text.isdigit() for text in bounds):
+        raise ValueError(f"Invalid regular expression: Invalid repetition '{{{body}}}'")
+
+    if any(int(text) > MAX_REPEAT for text in bounds):
+        raise ValueError(
+            f"Invalid regular expression: Repetition count in '{{{body}}}' "
+            f"exceeds {MAX_REPEAT}"
+        )
+
+    min_count = int(min_text) if min_text else 0
+    if not comma:
+        return min_count, min_count
+    max_count = int(max_text) if max_text else None
+    if max_count is not None and max_count < min_count:
+        raise ValueError(f"Invalid regular expression: Invalid repetition '{{{body}}}'")
+    return min_count, max_count
+
+
+def _parse_class(body: str) -> Node:
+    if not body or body.startswith("^"):
+        raise ValueError(
+            f"Invalid regular expression: Unsupported character class '[{body}]'"
+        )
+    chars = set()
+    index = 0
+    while index < len(body):
+        if index + 2 < len(body) and body[index + 1] == "-":
+            first, last = ord(body[index]), ord(body[index + 2])
+            if first > last:
+                raise ValueError(
+                    f"Invalid regular expression: Invalid range '{body[index:index + 3]}'"
+                )
+            chars.update(chr(code) for code in range(first, last + 1))
+            index += 3
+        else:
+            chars.add(body[index])
+            index += 1
+    if len(chars) == 1:
+        return Symbol(chars.pop())
+    return CharClass(frozenset(chars))
+
+
+def _build_concat(items: list[Node]) -> Node:
+    if not items:
+        return EPSILON
+    if len(items) == 1:
+        return items[0]
+    return Concat(tuple(items))
+
+
+def _build_union(alternatives: list[Node], current: list[Node]) -> Node:
+    if not alternatives:
+        return _build_concat(current)
+    return Union(tuple(alternatives) + (_build_concat(current),))
+
+
+def postorder(node: Node) -> Iterator[Node]:
+    """Yields every node occurrence after its children, without recursion."""
+    stack = [(node, False)]
+    while stack:
+        current, expanded = stack.pop()
+        if expanded or not current.children:
+            yield current
+        else:
+            stack.append((current, True))
+            stack.extend((child, False) for child in reversed(current.children))
+
+
+def symbols(node: Node) -> set[str]:
+    result = set()
+    for current in postorder(node):
+        if isinstance(current, Symbol):
+            result.add(current.char)
+        elif isinstance(current, CharClass):
+            result.update(current.chars)
+    return result
+
+
+def expand_repeats(node: Node) -> Node:
+    """
+    Rewrites every counted repetition with concatenation, alternation and
+    star: r{2,4} becomes rr(|r(|r)). The copies of r are the same shared
+    subtree, so the result is linear in the expanded size. Raises
+    ValueError when the expanded size exceeds MAX_EXPANDED_SIZE, as nested
+    counts multiply.
+    """
+    stack: list[Node] = []
+    sizes: list[int] = []
+    for current in postorder(node):
+        if isinstance(current, Repeat):
+            size = sizes.pop()
+            copies = current.min + 1 if current.max is None else current.max
+            sizes.append(size * max(copies, 1) + copies)
+        elif isinstance(current, (Concat, Union)):
+            size = sum(sizes[-len(current.items) :]) + 1
+            del sizes[-len(current.items) :]
+            sizes.append(size)
+        elif isinstance(current, Star):
+            sizes.append(sizes.pop() + 1)
+        else:
+            sizes.append(1)
+        if sizes[-1] > MAX_EXPANDED_SIZE:
+            raise ValueError(
+                "Invalid regular expression: Repetitions expand to more than "
+                f"{MAX_EXPANDED_SIZE} nodes"
+            )
+
+        if isinstance(current, Repeat):
+            stack.append(_expand_repeat(stack.pop(), current.min, current.max))
+        elif isinstance(current, Star):
+            stack.append(Star(stack.pop()))
+        elif isinstance(current, (Concat, Union)):
+            items = tuple(stack[-len(current.items) :])
+            del stack[-len(current.items) :]
+            stack.append(current.__class__(items))
+        else:
+            stack.append(current)
+    return stack.pop()
+
+
+def _expand_repeat(item: Node, min_count: int, max_count: int | None) -> Node:
+    items = [item] * min_count
+    if max_count is None:
+        items.append(Star(item))
+    elif max_count > min_count:
+        optional = Union((EPSILON, item))
+        for _ in range(max_count - min_count - 1):
+            optional = Union((EPSILON, Concat((item, optional))))
+        items.append(optional)
+    return _build_concat(items)
+
+
+def postfix(node: Node) -> str:
+    """
+    Renders the tree in postfix notation with binary left-associative
+    "." and "|" operators, the empty word renders as nothing.
+    """
+    output = []
+    stack = [(node, 0)]
+    while stack:
+        current, index = stack.pop()
+        children = current.children
+        if index > 1:
+            output.append("." if isinstance(current, Concat) else "|")
+        if index < len(children):
+            stack.append((current, index + 1))
+            stack.append((children[index], 0))
+        elif isinstance(current, (Star, Repeat)):
+            output.append(_quantifier(current))
+        elif isinstance(current, Symbol):
+            output.append(current.char)
+        elif isinstance(current, CharClass):
+            output.append(_class_text(current))
+        elif current is EMPTY:
+            output.append("∅")
+    return "".join(output)
+
+
+def unparse(node: Node) -> str:
+    """
+    Renders the tree back to regex syntax with the fewest parentheses the
+    parser needs, the empty word renders as an empty alternative or "()".
+    """
+    output = []
+    stack = [(node, 0, False)]
+    while stack:
+        current, index, wrap = stack.pop()
+        children = current.children
+        if index == 0 and wrap:
+            output.append("(")
+        if 0 < index < len(children) and isinstance(current, Union):
+            output.append("|")
+        if index < len(children):
+            stack.append((current, index + 1, wrap))
+            child = children[index]
+            stack.append((child, 0, _needs_parentheses(current, child)))
+            continue
+
+        if isinstance(current, Symbol):
+            output.append(current.char)
+        elif isinstance(current, CharClass):
+            output.append(_class_text(current))
+        elif current is EMPTY:
+            output.append("∅")
+        if isinstance(current, (Star, Repeat)):
+            output.append(_quantifier(current))
+        if wrap:
+            output.append(")")
+    return "".join(output)
+
+
+def _quantifier(node: Node) -> str:
+    if isinstance(node, Star):
+        return "*"
+    if node.min == 0 and node.max == 1:
+        return "?"
+    if node.min == node.max:
+        return f"{{{node.min}}}"
+    return f"{{{node.min},{'' if node.max is None else node.max}}}"
+
+
+def _class_text(node: CharClass) -> str:
+    codes = sorted(map(ord, node.chars))
+    parts = []
+    start = 0
+    for end in range(1, len(codes) + 1):
+        if end == len(codes) or codes[end] != codes[end - 1] + 1:
+            if end - start >= 3:
+                parts.append(f"{chr(codes[start])}-{chr(codes[end - 1])}")
+            else:
+                parts.extend(map(chr, codes[start:end]))
+            start = end
+    return f"[{''.join(parts)}]"
+
+
+def _needs_parentheses(parent: Node, child: Node) -> bool:
+    if isinstance(parent, (Star, Repeat)):
+        return not isinstance(child, (Symbol, CharClass, Empty))
+    if isinstance(parent, Concat):
+        return isinstance(child, Union) or child is EPSILON
+    return False
@@ -0,0 +1,229 @@
+from src.regex_ast import (
+    EMPTY,
+    EPSILON,
+    Concat,
+    Node,
+    Repeat,
+    Star,
+    Union,
+    _needs_parentheses,
+    _quantifier,
+    postorder,
+    unparse,
+)
+
+# Alternatives are sorted by the first _KEY_LENGTH characters of their
+# rendering, ties are broken by the order in which keys were computed.
+_KEY_LENGTH = 16
+
+
+def simplify(ast: Node) -> Node:
+    """
+    Rewrites a regex tree bottom-up into a smaller equivalent one.
+
+    Applied rules: ε and ∅ elimination in concatenations and alternations,
+    (r*)* = r*, ε* = ∅* = ε, (ε|r)* = (r*|s)* = (r|s)*, (r*s*)* = (r|s)*,
+    r*r* = r*, ε|rr* = r*, r{0,} = r*, r{1} = r, r? = r for nullable r,
+    alternatives are deduplicated, sorted and factored by their common
+    leading factors.
+    """
+    return _Simplifier().simplify(ast)
+
+
+class _Trie:
+    __slots__ = ("end", "children", "edges", "folded")
+
+    def __init__(self):
+        self.end = False
+        self.children: dict[Node, _Trie] = {}
+
+
+class _Simplifier:
+    def __init__(self):
+        self._keys: dict[Node, tuple[str, int]] = {}
+
+    def simplify(self, ast: Node) -> Node:
+        stack: list[Node] = []
+        for node in postorder(ast):
+            if isinstance(node, Star):
+                stack.append(self._star(stack.pop()))
+            elif isinstance(node, Repeat):
+                stack.append(self._repeat(stack.pop(), node.min, node.max))
+            elif isinstance(node, (Concat, Union)):
+                operands = stack[-len(node.items) :]
+                del stack[-len(node.items) :]
+                if isinstance(node, Concat):
+                    stack.append(self._concat(operands))
+                else:
+                    stack.append(self._union(operands))
+            else:
+                stack.append(node)
+        return stack.pop()
+
+    def _key(self, node: Node) -> tuple[str, int]:
+        key = self._keys.get(node)
+        if key is not None:
+            return key
+        stack = [node]
+        while stack:
+            current = stack[-1]
+            if current in self._keys:
+                stack.pop()
+                continue
+            missing = [child for child in current.children if child not in self._keys]
+            if missing:
+                stack.extend(missing)
+                continue
+            stack.pop()
+            self._keys[current] = (self._text(current), len(self._keys))
+        return self._keys[node]
+
+    def _text(self, node: Node) -> str:
+        """The start of unparse(node), built from the children's keys."""
+        if not node.children:
+            return unparse(node)[:_KEY_LENGTH]
+        parts = []
+        length = 0
+        for index, child in enumerate(node.children):
+            if length >= _KEY_LENGTH:
+                break
+            wrap = _needs_parentheses(node, child)
+            text = self._keys[child][0]
+            part = "".join(
+                (
+                    "|" if index and isinstance(node, Union) else "",
+                    "(" if wrap else "",
+                    text,
+                    ")" if wrap else "",
+                )
+            )
+            parts.append(part)
+            length += len(part)
+        if isinstance(node, (Star, Repeat)):
+            parts.append(_quantifier(node))
+        return "".join(parts)[:_KEY_LENGTH]
+
+    def _concat(self, items) -> Node:
+        flat: list[Node] = []
+        for item in items:
+            if item is EMPTY:
+                return EMPTY
+            for factor in item.items if isinstance(item, Concat) else (item,):
+                if factor is EPSILON:
+                    continue
+                if isinstance(factor, Star) and flat and flat[-1] == factor:
+                    continue
+                flat.append(factor)
+        if not flat:
+            return EPSILON
+        if len(flat) == 1:
+            return flat[0]
+        return Concat(tuple(flat))
+
+    def _union(self, items) -> Node:
+        unique: dict[Node, None] = {}
+        for item in items:
+            if isinstance(item, Union):
+                unique.update(dict.fromkeys(item.items))
+            elif item is not EMPTY:
+                unique[item] = None
+        return self._alternatives(self._factor_prefixes(self._drop_epsilon(unique)))
+
+    def _drop_epsilon(self, unique: dict[Node, None]) -> list[Node]:
+        if EPSILON in unique:
+            unique = dict.fromkeys(self._plus_to_star(item) for item in unique)
+        if EPSILON in unique and any(
+            item.nullable for item in unique if item is not EPSILON
+        ):
+            del unique[EPSILON]
+        return list(unique)
+
+    def _alternatives(self, alternatives: list[Node]) -> Node:
+        if not alternatives:
+            return EMPTY
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return Union(tuple(sorted(alternatives, key=self._key)))
+
+    def _plus_to_star(self, item: Node) -> Node:
+        if isinstance(item, Concat) and isinstance(item.items[-1], Star):
+            star = item.items[-1]
+            if self._concat(item.items[:-1]) == star.item:
+                return star
+        return item
+
+    def _factor_prefixes(self, alternatives: list[Node]) -> list[Node]:
+        """
+        Factors common leading factors out of alternatives through a trie of
+        their factor sequences: ab|ac|a becomes a(|b|c). Chains of trie nodes
+        with a single child are collapsed into one concatenation, and the
+        trie is folded bottom-up with an explicit stack.
+        """
+        root = _Trie()
+        for alternative in alternatives:
+            node = root
+            factors = alternative.items if isinstance(alternative, Concat) else ()
+            for factor in factors or (alternative,):
+                if factor is not EPSILON:
+                    node = node.children.setdefault(factor, _Trie())
+            node.end = True
+
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if not expanded:
+                node.edges = [
+                    self._chain(head, child) for head, child in node.children.items()
+                ]
+                stack.append((node, True))
+                stack.extend((branch, False) for _, branch in node.edges)
+                continue
+            factored = [EPSILON] if node.end else []
+            for heads, branch in node.edges:
+                factored.append(self._concat((*heads, branch.folded)))
+                del branch.folded
+            del node.edges
+            if node is root:
+                return factored
+            unique = dict.fromkeys(factored)
+            node.folded = self._alternatives(self._drop_epsilon(unique))
+
+    @staticmethod
+    def _chain(head: Node, node: _Trie) -> tuple[list[Node], _Trie]:
+        heads = [head]
+        while not node.end and len(node.children) == 1:
+            ((head, node),) = node.children.items()
+            heads.append(head)
+        return heads, node
+
+    def _star(self, item: Node) -> Node:
+        if isinstance(item, Star):
+            return item
+        if isinstance(item, Concat) and all(isinstance(i, Star) for i in item.items):
+            item = self._union(factor.item for factor in item.items)
+        if isinstance(item, Union):
+            item = self._union(
+                alternative.item if isinstance(alternative, Star) else alternative
+                for alternative in item.items
+                if alternative is not EPSILON
+            )
+        if item is EMPTY or item is EPSILON:
+            return EPSILON
+        if isinstance(item, Star):
+            return item
+        return Star(item)
+
+    def _repeat(self, item: Node, min_count: int, max_count: int | None) -> Node:
+        if max_count == 0 or item is EPSILON:
+            return EPSILON
+        if item is EMPTY:
+            return EPSILON if min_count == 0 else EMPTY
+        if isinstance(item, Star):
+            return item
+        if min_count == 0 and max_count is None:
+            return self._star(item)
+        if min_count == max_count == 1 or (
+            min_count == 0 and max_count == 1 and item.nullable
+        ):
+            return item
+        return Repeat(item, min_count, max_count)
@@ -0,0 +1,113 @@
+import heapq
+
+STRATEGIES = ("order", "degree", "weight", "dynamic")
+
+
+def eliminate_states(
+    regex_transitions: dict[int, dict[int, set[str]]],
+    start_state: int,
+    accept_state: int,
+    strategy: str = "order",
+) -> str:
+    """
+    Removes every state except start_state and accept_state from a
+    generalized automaton and returns the label left between them.
+
+    Edges are sets of alternative regexes, "ε" standing for the empty word.
+    The elimination order is chosen by strategy:
+    - "order": states in the order of regex_transitions;
+    - "degree": smallest in-degree × out-degree first;
+    - "weight": smallest weight first, the weight being the size the
+      regex grows by when the state is removed;
+    - "dynamic": like "weight", but weights of the neighbours are updated
+      after every elimination through a priority queue.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown elimination strategy: {strategy}")
+
+    outgoing = regex_transitions
+    incoming: dict[int, dict[int, set[str]]] = {state: {} for state in outgoing}
+    for state, row in list(outgoing.items()):
+        for next_state, labels in row.items():
+            incoming.setdefault(next_state, {})[state] = labels
+            outgoing.setdefault(next_state, {})
+
+    states = [state for state in outgoing if state not in (start_state, accept_state)]
+    if strategy == "degree":
+        states.sort(key=lambda state: _degree(state, incoming, outgoing))
+    elif strategy == "weight":
+        states.sort(key=lambda state: _weight(state, incoming, outgoing))
+
+    if strategy != "dynamic":
+        for state in states:
+            _eliminate(state, incoming, outgoing)
+    else:
+        versions = dict.fromkeys(states, 0)
+        queue = [(_weight(state, incoming, outgoing), state, 0) for state in states]
+        heapq.heapify(queue)
+        while queue:
+            _, state, version = heapq.heappop(queue)
+            if versions.get(state) != version:
+                continue
+            del versions[state]
+            for neighbour in _eliminate(state, incoming, outgoing):
+                if neighbour in versions:
+                    versions[neighbour] += 1
+                    weight = _weight(neighbour, incoming, outgoing)
+                    heapq.heappush(queue, (weight, neighbour, versions[neighbour]))
+
+    final_regexes = outgoing[start_state].get(accept_state)
+    return "|".join(sorted(final_regexes)) if final_regexes else "∅"
+
+
+def _eliminate(state, incoming, outgoing) -> set[int]:
+    self_loop = outgoing[state].pop(state, None)
+    incoming[state].pop(state, None)
+    sources = incoming.pop(state)
+    targets = outgoing.pop(state)
+    for source in sources:
+        del outgoing[source][state]
+    for target in targets:
+        del incoming[target][state]
+
+    R_jj_star = f"({'|'.join(sorted(self_loop))})*" if self_loop else "ε"
+    targets = {target: "|".join(sorted(R_jk)) for target, R_jk in targets.items()}
+    for source, R_ij in sources.items():
+        R_ij = "|".join(sorted(R_ij))
+        for target, R_jk in targets.items():
+            labels = outgoing[source].get(target)
+            if labels is None:
+                labels = outgoing[source][target] = incoming[target][source] = set()
+            labels.add(_combine_regexes(R_ij, R_jj_star, R_jk))
+    return sources.keys() | targets.keys()
+
+
+def _combine_regexes(R_ij, R_jj_star, R_jk):
+    parts = []
+    for part in (R_ij, R_jj_star, R_jk):
+        if part not in ("", "ε"):
+            if "|" in part or "*" in part:
+                part = f"({part})"
+            parts.append(part)
+    return "".join(parts) or "ε"
+
+
+def _degree(state, incoming, outgoing) -> int:
+    num_incoming = len(incoming[state]) - (state in incoming[state])
+    num_outgoing = len(outgoing[state]) - (state in outgoing[state])
+    return num_incoming * num_outgoing
+
+
+def _label_weight(labels: set[str]) -> int:
+    return sum(map(len, labels)) + len(labels) - 1
+
+
+def _weight(state, incoming, outgoing) -> int:
+    sources = [labels for s, labels in incoming[state].items() if s != state]
+    targets = [labels for t, labels in outgoing[state].items() if t != state]
+    self_loop = outgoing[state].get(state)
+    weight = sum(map(_label_weight, sources)) * (len(targets) - 1)
+    weight += sum(map(_label_weight, targets)) * (len(sources) - 1)
+    if self_loop:
+        weight += _label_weight(self_loop) * (len(sources) * len(targets) - 1)
+    return weight
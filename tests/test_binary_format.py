@@ -0,0 +1,190 @@
+import itertools
+import mmap
+import os
+import stat
+import struct
+import pytest
+from src import binary_format
+from src.dfa import DFA
+from src.nfa import NFA
+from src.regex import RegularExpression
+
+WORDS = [
+    "".join(word)
+    for length in range(7)
+    for word in itertools.product("abc", repeat=length)
+]
+
+
+def nfa(regex_str):
+    return NFA.from_regex(RegularExpression(regex_str))
+
+
+@pytest.mark.parametrize("regex_str", ["(a|b)*abb", "a*(b|ca)*|1", "0"])
+def test_nfa_round_trip(tmp_path, regex_str):
+    automaton = nfa(regex_str)
+    path = tmp_path / "nfa.bin"
+    automaton.save(path)
+
+    compact = binary_format.load(path)
+    restored = NFA.load(path)
+
+    assert isinstance(compact.edge_targets, memoryview)
+    assert sorted(restored.states) == sorted(automaton.states)
+    assert sorted(restored.accept_states) == sorted(automaton.accept_states)
+    assert restored.alphabet - {""} == automaton.alphabet - {""}
+    for word in WORDS:
+        assert compact.simulate(word) == automaton.simulate(word), word
+        assert restored.simulate(word) == automaton.simulate(word), word
+
+
+def test_dfa_round_trip(tmp_path):
+    automaton = DFA.from_nfa(nfa("(ab)*(a|ab)(b|ca)*")).minimize()
+    path = tmp_path / "dfa.bin"
+    automaton.save(path)
+
+    restored = DFA.load(path)
+
+    assert binary_format.load(path).deterministic
+    assert restored.transitions == automaton.transitions
+    for word in WORDS:
+        assert restored.simulate(word) == automaton.simulate(word), word
+
+
+def test_multichar_symbols(tmp_path):
+    automaton = NFA.from_string("""
+        States: 0 1 2
+        Alphabet: ab ц
+        Start: 0
+        Accept: 2
+        0 -> ab -> 1
+        1 -> ц -> 2
+        """)
+    path = tmp_path / "nfa.bin"
+    automaton.save(path)
+
+    assert binary_format.load(path).symbols == ("", "ab", "ц")
+
+
+def test_invalid_files(tmp_path):
+    path = tmp_path / "bad.bin"
+    nfa("ab").save(path)
+    data = bytearray(path.read_bytes())
+
+    path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        binary_format.load(path)
+
+    path.write_bytes(b"XXXX" + data[4:])
+    with pytest.raises(ValueError, match="magic"):
+        binary_format.load(path)
+
+    struct.pack_into("<H", data, 4, binary_format.VERSION + 1)
+    path.write_bytes(data)
+    with pytest.raises(ValueError, match="version"):
+        binary_format.load(path)
+
+    struct.pack_into("<H", data, 4, binary_format.VERSION)
+    path.write_bytes(data[:-16])
+    with pytest.raises(ValueError, match="truncated"):
+        binary_format.load(path)
+
+
+def test_large_dfa_loads_without_copying(tmp_path):
+    num_states = 200000
+    dfa = DFA()
+    dfa.states = list(range(num_states))
+    dfa.alphabet = {"a", "b"}
+    dfa.start_state = 0
+    dfa.accept_states = [num_states - 1]
+    dfa.transitions = {
+        state: {"a": (state + 1) % num_states, "b": 0} for state in range(num_states)
+    }
+    path = tmp_path / "large.bin"
+    dfa.save(path)
+
+    compact = binary_format.load(path)
+
+    for array in (compact.offsets, compact.edge_symbols, compact.edge_targets):
+        assert isinstance(array, memoryview)
+        assert isinstance(array.obj, mmap.mmap)
+        assert array.readonly
+    assert compact.num_states == num_states
+    assert compact.simulate("a" * (num_states - 1))
+    assert not compact.simulate("a" * (num_states - 2) + "b")
+
+
+def _section_offsets(data: bytes) -> dict[str, int]:
+    fields = struct.unpack_from("<4sHHIIIII", data)
+    num_states, num_edges, symbol_table_size = fields[3], fields[5], fields[6]
+    sizes = {
+        "header": struct.calcsize("<4sHHIIIII"),
+        "symbols": symbol_table_size,
+        "labels": 8 * num_states,
+        "offsets": 4 * (num_states + 1),
+        "edge_symbols": 4 * num_edges,
+        "edge_targets": 4 * num_edges,
+    }
+    positions = {}
+    position = 0
+    for name, size in sizes.items():
+        position += -position % 8
+        positions[name] = position
+        position += size
+    return positions
+
+
+@pytest.mark.parametrize(
+    "section, value, message",
+    [
+        ("offsets", 1, "offsets"),
+        ("edge_targets", 1000, "out of range"),
+        ("edge_symbols", 1000, "out of range"),
+    ],
+)
+def test_corrupt_arrays_are_rejected(tmp_path, section, value, message):
+    path = tmp_path / "corrupt.bin"
+    nfa("ab|c").save(path)
+    data = bytearray(path.read_bytes())
+    struct.pack_into("=I", data, _section_offsets(data)[section], value)
+    path.write_bytes(data)
+
+    with pytest.raises(ValueError, match=message):
+        binary_format.load(path)
+
+
+def test_saved_files_follow_umask_and_existing_mode(tmp_path):
+    path = tmp_path / "mode.bin"
+    umask = os.umask(0o022)
+    try:
+        nfa("ab").save(path)
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+    path.chmod(0o640)
+    nfa("ab").save(path)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+
+def test_save_does_not_change_mapped_files(tmp_path):
+    large = DFA()
+    large.states = list(range(257))
+    large.alphabet = {"a", "b"}
+    large.start_state = 0
+    large.accept_states = [7]
+    large.transitions = {state: {"b": state + 1} for state in range(256)}
+    large.transitions[0]["a"] = 0
+    small = DFA()
+    small.states = [0]
+    small.start_state = 0
+    path = tmp_path / "shared.bin"
+    large.save(path)
+
+    mapped = binary_format.load(path)
+    small.save(path)
+
+    assert mapped.simulate("abbbbbbb")
+    assert mapped.num_states == 257
+    assert DFA.load(path).states == [0]
+    assert [entry.name for entry in tmp_path.iterdir()] == ["shared.bin"]
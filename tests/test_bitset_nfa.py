@@ -0,0 +1,65 @@
+import itertools
+import pytest
+from src.bitset_nfa import BitsetNFA
+from src.nfa import NFA
+from src.regex import RegularExpression
+
+
+@pytest.mark.parametrize(
+    "regex_str",
+    ["(ab)*(a|ab)(b|ca)*", "((a|b)*ab(a|b)*)*", "(a*b*)*|(c*d*)*", "a(|b)c", "∅"],
+)
+def test_bitset_simulation_matches_nfa(regex_str):
+    nfa = NFA.from_regex(RegularExpression(regex_str))
+    bitset = nfa.to_bitset()
+
+    assert len(bitset.states) > 8 or regex_str == "∅"
+    for length in range(5):
+        for word in map("".join, itertools.product("abcd", repeat=length)):
+            assert bitset.simulate(word) == nfa.simulate(word), word
+
+
+def test_bitset_from_string_nfa():
+    nfa = NFA.from_string("""
+        States: 0 1 2
+        Alphabet: a b
+        Start: 0
+        Accept: 2
+        0 -> a -> 0,1
+        0 ->  -> 1
+        1 -> b -> 2
+        """)
+    bitset = nfa.to_bitset()
+
+    assert bitset.to_states(bitset.start_state) == {0, 1}
+    assert bitset.to_states(bitset.step(bitset.start_state, "a")) == {0, 1}
+    assert bitset.simulate("b")
+    assert bitset.simulate("aab")
+    assert not bitset.simulate("ba")
+    assert not bitset.simulate("c")
+
+
+@pytest.mark.parametrize("max_cached", [1, 4096])
+def test_bitset_on_large_sparse_nfa(max_cached):
+    words = ["".join(word) for word in itertools.product("abc", repeat=4)]
+    nfa = NFA.from_regex(RegularExpression("(" + "|".join(words[:60]) + ")*d"))
+    bitset = BitsetNFA(nfa, max_cached=max_cached)
+
+    assert len(bitset.states) > 400
+    for word in ["d", "aaaad", "aaaaaacad", "abcad", "aaabd", "ccccd", "aaaa"]:
+        assert bitset.simulate(word) == nfa.simulate(word), word
+    assert all(len(cache) <= max_cached for cache in bitset._cache.values())
+
+
+def test_successor_masks_match_step_without_memo():
+    nfa = NFA.from_regex(RegularExpression("(a|b)*a(a|b)(a|b)(a|b)c"))
+    bitset = nfa.to_bitset()
+    symbols = ["a", "b", "c", "d"]
+
+    masks = [bitset.start_state]
+    for mask in masks:
+        next_masks = bitset.successor_masks(mask, symbols)
+        assert not any(bitset._cache.values())
+        assert next_masks == [bitset.step(mask, symbol) for symbol in symbols]
+        bitset._cache = {symbol: {} for symbol in bitset.alphabet}
+        masks.extend(m for m in next_masks if m and m not in masks)
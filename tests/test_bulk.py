@@ -0,0 +1,59 @@
+import pytest
+from src.bulk import compile_file, compile_many, main
+from src.dfa import DFA
+
+
+@pytest.fixture
+def regex_file(tmp_path):
+    path = tmp_path / "patterns.txt"
+    path.write_text("a(b|c)*\n\n(a|b)*abb\na(b\na{2,3}\n", encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_compile_file_keeps_order_and_errors(regex_file, processes):
+    results = list(compile_file(str(regex_file), processes=processes, chunksize=1))
+
+    assert [result.line_number for result in results] == [1, 3, 4, 5]
+    assert results[0].dfa.simulate("abcb")
+    assert results[1].dfa.simulate("babb")
+    assert results[2].dfa is None
+    assert "Unmatched opening parenthesis" in results[2].error
+    assert results[3].dfa.simulate("aaa")
+    assert not results[3].dfa.simulate("a")
+
+
+def test_unexpected_errors_stay_on_their_line(monkeypatch):
+    from_regex = DFA.from_regex
+
+    def failing_from_regex(regex):
+        if regex.get_regex() == "boom":
+            raise OverflowError("too large")
+        return from_regex(regex)
+
+    monkeypatch.setattr(DFA, "from_regex", failing_from_regex)
+    lines = [(1, "boom"), (2, "a{99999999999999999999}"), (3, "ab"), (4, "a*")]
+    results = list(compile_many(lines, processes=1))
+
+    assert [result.error is None for result in results] == [False, False, True, True]
+    assert results[0].error == "too large"
+    assert "Repetition count" in results[1].error
+    assert results[2].dfa.simulate("ab")
+    assert results[3].dfa.simulate("aaa")
+
+
+def test_lines_are_not_read_as_file_paths(tmp_path):
+    path = tmp_path / "single.txt"
+    path.write_text("ab", encoding="utf-8")
+
+    (result,) = compile_many([(1, str(path))], processes=1)
+
+    assert result.dfa is None
+
+
+def test_entry_point_reports_errors(regex_file, capsys):
+    assert main([str(regex_file), "--processes", "1"]) == 1
+
+    captured = capsys.readouterr()
+    assert "1: " in captured.out
+    assert "4: error:" in captured.err
@@ -0,0 +1,37 @@
+import pickle
+import pytest
+from src.codegen import CompiledDFA
+from src.dfa import DFA
+from src.regex import RegularExpression
+
+
+@pytest.mark.parametrize(
+    "regex_str", ["(ab)*(a|ab)(b|ca)*", "(a|b)*abb(a|b)*", "a∅", "a*b*|ba"]
+)
+def test_compiled_matches_simulate(regex_str):
+    dfa = DFA.from_regex(RegularExpression(regex_str))
+    compiled = dfa.compile()
+
+    words = ["", "a", "ab", "abb", "abca", "abab", "ba", "bab", "aabb", "abx", "c"]
+    for word in words:
+        assert compiled(word) == dfa.simulate(word), word
+        assert compiled.simulate(word) == dfa.simulate(word), word
+
+
+def test_generated_source_is_plain_python():
+    compiled = DFA.from_regex(RegularExpression("ab*")).minimize().compile()
+
+    assert "def match(text" in compiled.source
+    assert "_rows[0].update({'a': _rows[1], None: False})" in compiled.source
+
+
+def test_pickle_round_trip_by_source():
+    compiled = DFA.from_regex(RegularExpression("a(b|c)*")).compile()
+
+    restored = pickle.loads(pickle.dumps(compiled))
+
+    assert isinstance(restored, CompiledDFA)
+    assert restored.source == compiled.source
+    assert restored.match is compiled.match
+    assert restored("abcb")
+    assert not restored("ba")
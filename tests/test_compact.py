@@ -0,0 +1,106 @@
+import itertools
+import pickle
+import pytest
+from src import binary_format
+from src.bitset_nfa import BitsetNFA
+from src.dfa import DFA
+from src.lazy_dfa import LazyDFA
+from src.nfa import NFA
+from src.regex import RegularExpression
+
+WORDS = [
+    "".join(word)
+    for length in range(5)
+    for word in itertools.product("abc", repeat=length)
+]
+
+
+@pytest.mark.parametrize("regex_str", ["(ab)*(a|ab)(b|ca)*", "a(b|c)*", "a(|b)c"])
+def test_compact_nfa_round_trip(regex_str):
+    nfa = NFA.from_regex(RegularExpression(regex_str))
+    compact = nfa.to_compact()
+    restored = NFA.from_compact(compact)
+
+    assert not compact.deterministic
+    assert compact.num_states == len(nfa.states)
+    assert restored.start_state == nfa.start_state
+    assert sorted(restored.accept_states) == sorted(nfa.accept_states)
+    for word in WORDS:
+        assert compact.simulate(word) == nfa.simulate(word) == restored.simulate(word)
+
+
+def test_compact_dfa_round_trip():
+    dfa = DFA.from_regex(RegularExpression("(a|b)*abb"))
+    compact = dfa.to_compact()
+    restored = DFA.from_compact(compact)
+
+    assert compact.deterministic
+    assert restored.transitions == dfa.transitions
+    assert sorted(restored.accept_states) == sorted(dfa.accept_states)
+    for word in WORDS:
+        assert compact.simulate(word) == dfa.simulate(word)
+
+
+def test_compact_layout():
+    nfa = NFA.from_string("""
+        States: 0 1 2
+        Alphabet: a b
+        Start: 0
+        Accept: 2
+        0 -> b -> 0
+        0 -> a -> 1,0
+        1 -> b -> 2
+        """)
+    compact = nfa.to_compact()
+
+    assert compact.symbols == ("", "a", "b")
+    assert list(compact.offsets) == [0, 3, 4, 4]
+    assert list(compact.edge_symbols) == [1, 1, 2, 2]
+    assert list(compact.edge_targets) == [0, 1, 0, 2]
+    assert sorted(compact.successors(0, 1)) == [0, 1]
+    assert compact.is_accepting(2) and not compact.is_accepting(1)
+    assert not hasattr(compact, "__dict__")
+
+
+def test_nfa_from_compact_rejects_to_dfa():
+    compact = NFA.from_regex(RegularExpression("a|b")).to_compact()
+    with pytest.raises(ValueError):
+        DFA.from_compact(compact)
+
+
+def test_compact_pickles():
+    compact = DFA.from_regex(RegularExpression("a(b|c)*")).to_compact()
+    restored = pickle.loads(pickle.dumps(compact))
+
+    assert restored.simulate("abcb")
+    assert not restored.simulate("b")
+
+
+@pytest.mark.parametrize("regex_str", ["(ab)*(a|ab)(b|ca)*", "a(b|c)*", "a(|b)c", "∅"])
+def test_determinize_compact_directly(regex_str):
+    nfa = NFA.from_regex(RegularExpression(regex_str))
+    compact = nfa.to_compact()
+    expected = DFA.from_nfa(nfa)
+    bitset = BitsetNFA(compact)
+
+    assert bitset.live_mask == BitsetNFA(nfa).live_mask
+    for method in ["bitset", "sets"]:
+        dfa = DFA.from_nfa(compact, method=method)
+        for word in WORDS:
+            assert dfa.simulate(word) == expected.simulate(word), word
+    assert DFA.from_nfa(compact).transitions == expected.transitions
+    for word in WORDS:
+        assert bitset.simulate(word) == nfa.simulate(word), word
+
+
+def test_determinize_mapped_compact_in_parallel(tmp_path):
+    nfa = NFA.from_regex(RegularExpression("(a|b)*a(a|b)(a|b)"))
+    path = tmp_path / "nfa.bin"
+    nfa.save(path)
+    compact = binary_format.load(path)
+
+    dfa = DFA.from_nfa(compact, method="parallel", processes=2)
+
+    assert dfa.transitions == DFA.from_nfa(nfa, method="bitset").transitions
+    assert LazyDFA(compact).simulate("baab")
+    assert not LazyDFA(compact).simulate("abab")
@@ -0,0 +1,111 @@
+import copy
+import pickle
+
+import pytest
+from src.dfa import DFA
+from src.regex import RegularExpression
+from src.compile_cache import CompileCache, compile_regex, get_default_cache
+
+
+def test_cache_hits_share_the_automaton():
+    cache = CompileCache()
+
+    first = cache.get("a(b|c)*")
+    second = cache.get(RegularExpression("a(b|c)*"))
+
+    assert first is second
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert first.simulate("abcb")
+    assert not first.simulate("b")
+
+
+def test_cache_key_is_normalized_text():
+    cache = CompileCache()
+
+    cache.get("a+b")
+
+    assert "a|b" in cache
+    assert cache.get("a|b") is cache.get("a+b")
+    assert cache.misses == 1
+
+
+def test_lru_eviction_by_entries():
+    cache = CompileCache(max_entries=2)
+
+    cache.get("a")
+    cache.get("b")
+    cache.get("a")
+    cache.get("c")
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+
+def test_eviction_by_bytes():
+    cache = CompileCache(max_bytes=1)
+
+    dfa = cache.get("ab")
+
+    assert dfa.simulate("ab")
+    assert len(cache) == 0
+    assert cache.current_bytes == 0
+
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        CompileCache(max_entries=0)
+
+
+def test_default_cache():
+    assert compile_regex("(a|b)*abb") is compile_regex("(a+b)*abb")
+    assert get_default_cache().hits >= 1
+
+
+def test_cached_automata_are_read_only():
+    cache = CompileCache()
+    dfa = cache.get("a(b|c)*")
+
+    with pytest.raises(AttributeError):
+        dfa.accept_states.append(0)
+    with pytest.raises(TypeError):
+        dfa.transitions[dfa.start_state]["a"] = dfa.start_state
+    with pytest.raises(TypeError):
+        dfa.transitions[-1] = {}
+    with pytest.raises(AttributeError):
+        dfa.alphabet.add("d")
+    with pytest.raises(AttributeError):
+        dfa.start_state = 1
+
+    assert cache.get("a(b|c)*").simulate("abc")
+
+
+def test_operations_on_cached_automata_return_mutable_copies():
+    dfa = compile_regex("a(b|c)*")
+
+    for result in [
+        copy.deepcopy(dfa),
+        dfa.complement(),
+        dfa.make_complete(),
+        dfa.minimize(method="table"),
+        pickle.loads(pickle.dumps(dfa)).thaw(),
+    ]:
+        result.accept_states.append(-1)
+        result.alphabet.add("d")
+    assert dfa.complement().simulate("b")
+    assert dfa.equivalent(DFA.from_regex(RegularExpression("a(c|b)*")))
+    assert dfa.compile()("abcb")
+    assert DFA.from_compact(dfa.to_compact()).simulate("ac")
+    assert dfa.to_regex().simulate("acb")
+
+
+def test_patterns_are_not_read_as_file_paths(tmp_path, monkeypatch):
+    (tmp_path / "ab").write_text("b", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    cache = CompileCache()
+
+    assert cache.get("ab").simulate("ab")
+    assert not cache.get("ab").simulate("b")
+    assert "ab" in cache
@@ -0,0 +1,87 @@
+import itertools
+import pytest
+from src.dfa import DFA
+from src.nfa import NFA
+from src.regex import RegularExpression
+
+WORDS = [
+    "".join(word)
+    for length in range(8)
+    for word in itertools.product("ab", repeat=length)
+]
+REGEXES = ["(a|b)*abb(a|b)*", "(a|b)*", "a*b*", "(ab)*(a|ab)(b|ba)*", "(aa|ab|b)*", "∅"]
+
+
+def nfa(regex_str):
+    return NFA.from_regex(RegularExpression(regex_str))
+
+
+@pytest.mark.parametrize("left", REGEXES)
+@pytest.mark.parametrize("right", REGEXES)
+def test_inclusion_matches_brute_force(left, right):
+    left, right = nfa(left), nfa(right)
+    bad = [w for w in WORDS if left.simulate(w) and not right.simulate(w)]
+
+    result = left.is_subset_of(right)
+
+    assert bool(result) == (not bad)
+    if bad:
+        assert len(result.counterexample) == len(bad[0])
+        assert left.simulate(result.counterexample)
+        assert not right.simulate(result.counterexample)
+
+
+def test_universality():
+    assert nfa("(a|b)*").is_universal()
+    assert nfa("(a|bb|b)*").is_universal()
+
+    result = nfa("(aa|ab|b)*").is_universal()
+    assert not result
+    assert result.counterexample == "a"
+    assert not nfa("a*").is_universal({"a", "b"})
+
+
+def test_emptiness():
+    assert nfa("∅").is_empty()
+    assert nfa("a∅b|∅*∅").is_empty()
+
+    result = nfa("(a|b)*abb").is_empty()
+    assert not result
+    assert result.counterexample == "abb"
+
+
+def test_inclusion_without_full_determinization():
+    n = 16
+    left = nfa("(a|b)*a" + "(a|b)" * n)
+
+    assert left.is_subset_of(nfa("(a|b)*"))
+    result = nfa("(a|b)*").is_subset_of(left)
+    assert not result
+    assert result.counterexample == ""
+
+
+@pytest.mark.parametrize("left", REGEXES)
+@pytest.mark.parametrize("right", REGEXES)
+def test_equivalence_matches_brute_force(left, right):
+    automata = [nfa(left), DFA.from_regex(RegularExpression(right))]
+    left, right = automata
+    bad = [w for w in WORDS if left.simulate(w) != right.simulate(w)]
+
+    for result in (left.equivalent(right), right.equivalent(left)):
+        assert bool(result) == (not bad)
+        if bad:
+            assert len(result.counterexample) == len(bad[0])
+            assert left.simulate(result.counterexample) != right.simulate(
+                result.counterexample
+            )
+
+
+def test_equivalence_of_rewritten_regexes():
+    original = DFA.from_regex(RegularExpression("(a|b)*abb(a|b)*"))
+    rewritten = nfa("(b|a)*ab(b)(b|a)*|(a|b)*abbb*(a|b)*")
+
+    assert original.minimize().equivalent(rewritten)
+    assert nfa("(a|b)*a(a|b)(a|b)").equivalent(nfa("(b|a)*a(b|a)(b|a)"))
+    result = nfa("(ab)*").equivalent(nfa("(ab)*|ba"))
+    assert not result
+    assert result.counterexample == "ba"
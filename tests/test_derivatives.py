@@ -0,0 +1,55 @@
+import pytest
+from src.nfa import NFA
+from src.regex import RegularExpression
+from src.regex_ast import parse
+from src.derivatives import DerivativeMatcher
+
+
+@pytest.mark.parametrize(
+    "regex_str",
+    [
+        "a",
+        "a*b",
+        "(ab)*(a|ab)(b|ca)*",
+        "(a|b|c)*d(e|f)*",
+        "(a*b*)*|(c*d*)*",
+        "((a|b)*ab(a|b)*)*",
+        "a(|b)c",
+        "∅",
+        "",
+    ],
+)
+def test_derivative_matcher_agrees_with_nfa(regex_str):
+    regex = RegularExpression(regex_str)
+    nfa = NFA.from_regex(regex)
+
+    words = ["", "a", "b", "ab", "ac", "abc", "abab", "ababca", "abcdef", "ccdd", "ba"]
+    for word in words:
+        assert regex.simulate(word) == nfa.simulate(word), word
+
+
+def test_states_are_built_on_demand():
+    matcher = DerivativeMatcher(parse("(a|b)*a(a|b)(a|b)(a|b)(a|b)"))
+    assert len(matcher.states) == 2
+
+    assert not matcher.simulate("bbbb")
+    assert len(matcher.states) == 2
+
+    assert not matcher.simulate("ba")
+    assert len(matcher.states) == 3
+
+
+def test_aci_normalization_keeps_state_space_finite():
+    matcher = DerivativeMatcher(parse("(a|b)*abb"))
+    for length in range(1, 8):
+        matcher.simulate("ab" * length + "b")
+
+    assert len(matcher.states) <= 6
+
+
+def test_unknown_symbol_reaches_dead_state():
+    regex = RegularExpression("ab")
+    assert not regex.simulate("ac")
+    assert regex.matcher().step(regex.matcher().start_state, "z") == (
+        regex.matcher().dead_state
+    )
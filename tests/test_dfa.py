@@ -84,3 +84,85 @@ def test_unknown_symbols():
 
     assert not dfa.simulate("abc"), "DFA should reject input with invalid symbols"
     assert not dfa.simulate("c"), "DFA should reject input with invalid symbols"
+
+
+def test_dfa_from_glushkov_nfa():
+    dfa = DFA.from_regex(RegularExpression("(a|b)*abb"), method="glushkov")
+
+    assert dfa.simulate("abb")
+    assert dfa.simulate("babb")
+    assert not dfa.simulate("ab")
+    assert len(dfa.minimize().states) == 4
+
+
+def test_hopcroft_minimization_of_partial_dfa():
+    dfa = DFA.from_string("""
+        States: 0 1 2 3 4 5
+        Alphabet: a b
+        Start: 0
+        Accept: 3 4
+        0 -> a -> 1
+        0 -> b -> 2
+        1 -> a -> 3
+        2 -> a -> 4
+        3 -> b -> 3
+        4 -> b -> 4
+        5 -> a -> 3
+        """)
+
+    minimized = dfa.minimize()
+
+    assert minimized.states == [0, 1, 2]
+    assert minimized.transitions == {0: {"a": 1, "b": 1}, 1: {"a": 2}, 2: {"b": 2}}
+    assert minimized.accept_states == [2]
+    assert len(dfa.minimize(method="table").states) == 4
+
+
+def test_hopcroft_matches_table_minimization():
+    for regex_str in ["(a|b)*abb", "(ab)*(a|ab)(b|ba)*", "a*b*|b*a*", "(aa|ab|b)*"]:
+        dfa = DFA.from_regex(RegularExpression(regex_str))
+        hopcroft = dfa.minimize()
+        table = dfa.minimize(method="table")
+
+        assert hopcroft.equivalent(table)
+        has_dead_state = not hopcroft.is_complete()
+        assert len(hopcroft.states) == len(table.states) - has_dead_state
+
+
+def test_hopcroft_minimization_of_empty_language():
+    minimized = DFA.from_regex(RegularExpression("a∅")).minimize()
+
+    assert minimized.states == [0]
+    assert minimized.accept_states == []
+    assert not minimized.simulate("")
+
+
+def test_unknown_minimization_method():
+    with pytest.raises(ValueError):
+        DFA.from_regex(RegularExpression("a")).minimize(method="brzozowski")
+
+
+@pytest.mark.parametrize(
+    "regex_str", ["(a|b)*a(a|b)(a|b)", "(ab)*(a|ab)(b|ca)*", "a∅|b*", "(a|)(b|)"]
+)
+def test_bitset_determinization_matches_sets(regex_str):
+    nfa = NFA.from_regex(RegularExpression(regex_str))
+
+    bitset_dfa = DFA.from_nfa(nfa, method="bitset")
+    sets_dfa = DFA.from_nfa(nfa, method="sets")
+
+    assert len(bitset_dfa.states) == len(sets_dfa.states)
+    assert bitset_dfa.equivalent(sets_dfa)
+
+
+def test_bitset_determinization_numbers_states_in_bfs_order():
+    dfa = DFA.from_nfa(NFA.from_regex(RegularExpression("ab|b")), method="bitset")
+
+    assert dfa.states == [0, 1, 2, 3]
+    assert dfa.transitions == {0: {"a": 1, "b": 2}, 1: {"b": 3}, 2: {}, 3: {}}
+    assert dfa.accept_states == [2, 3]
+
+
+def test_unknown_determinization_method():
+    with pytest.raises(ValueError):
+        DFA.from_nfa(NFA.from_regex(RegularExpression("a")), method="brzozowski")
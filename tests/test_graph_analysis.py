@@ -0,0 +1,70 @@
+import pytest
+from src.graph_analysis import (
+    epsilon_closures,
+    productive_states,
+    reachable_states,
+    useful_states,
+)
+from src.nfa import NFA
+from src.regex import RegularExpression
+
+
+def naive_closure(nfa, state):
+    closure = {state}
+    stack = [state]
+    while stack:
+        for next_state in nfa.transitions.get(stack.pop(), {}).get("", []):
+            if next_state not in closure:
+                closure.add(next_state)
+                stack.append(next_state)
+    return closure
+
+
+@pytest.mark.parametrize(
+    "regex_str", ["(a*b*)*|(c*d*)*", "((a|b)*ab(a|b)*)*", "(|a)*(b|)*c?"]
+)
+def test_epsilon_closures_match_dfs(regex_str):
+    nfa = NFA.from_regex(RegularExpression(regex_str))
+    closures = epsilon_closures(nfa.states, nfa.transitions)
+
+    for state in nfa.states:
+        assert closures[state] == naive_closure(nfa, state)
+
+
+def test_epsilon_cycle_shares_closure():
+    transitions = {0: {"": [1]}, 1: {"": [2]}, 2: {"": [0, 3]}, 3: {"a": [0]}}
+    closures = epsilon_closures([0, 1, 2, 3], transitions)
+
+    assert closures[0] == {0, 1, 2, 3}
+    assert closures[0] is closures[1] is closures[2]
+    assert closures[3] == {3}
+
+
+def test_long_epsilon_chain():
+    size = 3000
+    transitions = {state: {"": [state + 1]} for state in range(size)}
+    closures = epsilon_closures(range(size + 1), transitions)
+
+    assert len(closures[0]) == size + 1
+    assert closures[size] == {size}
+
+
+def test_reachable_and_productive_states():
+    transitions = {
+        0: {"a": [1]},
+        1: {"b": [2]},
+        2: {},
+        3: {"a": [2]},
+        4: {"a": [4]},
+    }
+
+    assert reachable_states(0, transitions) == {0, 1, 2}
+    assert productive_states([2], transitions) == {0, 1, 2, 3}
+    assert useful_states(0, [2], transitions) == {0, 1, 2}
+
+
+def test_graph_analysis_on_dfa_transitions():
+    transitions = {0: {"a": 1, "b": 2}, 1: {"a": 1}, 2: {}}
+
+    assert reachable_states(0, transitions) == {0, 1, 2}
+    assert productive_states([2], transitions) == {0, 2}
@@ -0,0 +1,64 @@
+import itertools
+import pytest
+from src.lazy_dfa import LazyDFA
+from src.nfa import NFA
+from src.regex import RegularExpression
+
+WORDS = [
+    "".join(word)
+    for length in range(8)
+    for word in itertools.product("abc", repeat=length)
+]
+
+
+def nfa(regex_str):
+    return NFA.from_regex(RegularExpression(regex_str))
+
+
+def test_matches_nfa_simulation():
+    automaton = nfa("(ab)*(a|ab)(b|ca)*|(a|b)*a(a|b)(a|b)")
+    lazy = automaton.lazy_dfa()
+
+    for word in WORDS:
+        assert lazy.simulate(word) == automaton.simulate(word), word
+
+
+def test_counters():
+    lazy = nfa("(a|b)*abb").lazy_dfa()
+
+    assert lazy.simulate("aabb")
+    assert (lazy.hits, lazy.misses, lazy.flushes) == (0, 4, 0)
+    assert lazy.simulate("aabb")
+    assert (lazy.hits, lazy.misses) == (4, 4)
+    assert len(lazy) == 4
+
+
+def test_budget_flushes_cache():
+    automaton = nfa("(a|b)*a(a|b)(a|b)(a|b)(a|b)")
+    lazy = LazyDFA(automaton, max_states=8)
+
+    for word in WORDS:
+        assert lazy.simulate(word) == automaton.simulate(word), word
+        assert len(lazy) <= 8
+    assert lazy.flushes > 0
+
+
+def test_states_survive_flushes():
+    automaton = nfa("(a|b)*a(a|b)(a|b)")
+    lazy = LazyDFA(automaton, max_states=3)
+    matcher = lazy.matcher()
+
+    matcher.feed("ba")
+    snapshot = matcher.snapshot()
+    matcher.feed("bbbabab")
+    matcher.restore(snapshot)
+    matcher.feed("ab")
+
+    assert matcher.is_accepting()
+    assert lazy.flushes > 0
+    assert lazy.simulate_many(["abb", "bbb", "aaaa"]) == [True, False, True]
+
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        LazyDFA(nfa("a"), max_states=1)
@@ -0,0 +1,91 @@
+import pytest
+from src.dfa import DFA
+from src.nfa import NFA
+from src.regex import RegularExpression
+
+
+def build(kind, regex_str):
+    regex = RegularExpression(regex_str)
+    return NFA.from_regex(regex) if kind == "nfa" else DFA.from_regex(regex)
+
+
+@pytest.mark.parametrize("kind", ["nfa", "dfa"])
+def test_chunked_input_matches_whole_input(kind):
+    automaton = build(kind, "(ab)*(a|ab)(b|ca)*")
+    word = "ababcab"
+    for split in range(len(word) + 1):
+        matcher = automaton.matcher()
+        matcher.feed(word[:split])
+        matcher.feed(word[split:])
+        assert matcher.is_accepting() == automaton.simulate(word)
+
+
+@pytest.mark.parametrize("kind", ["nfa", "dfa"])
+def test_dead_matcher_stops_early(kind):
+    matcher = build(kind, "ab*c").matcher()
+
+    assert matcher.feed("abb")
+    assert not matcher.is_dead()
+    assert not matcher.feed("bcx")
+    assert matcher.is_dead()
+    assert not matcher.feed("c")
+    assert not matcher.is_accepting()
+
+
+@pytest.mark.parametrize("kind", ["nfa", "dfa"])
+def test_dead_when_no_accept_state_is_reachable(kind):
+    automaton = NFA.from_string("""
+        States: 0 1 2
+        Alphabet: a b
+        Start: 0
+        Accept: 1
+        0 -> a -> 1
+        0 -> b -> 2
+        2 -> a -> 2
+        """)
+    if kind == "dfa":
+        automaton = DFA.from_nfa(automaton)
+    matcher = automaton.matcher()
+
+    assert not matcher.feed("b")
+    assert matcher.is_dead()
+
+
+@pytest.mark.parametrize("kind", ["nfa", "dfa"])
+def test_snapshot_restore_and_reset(kind):
+    matcher = build(kind, "a(b|c)*d").matcher()
+
+    matcher.feed("ab")
+    snapshot = matcher.snapshot()
+    matcher.feed("d")
+    assert matcher.is_accepting()
+
+    matcher.restore(snapshot)
+    assert not matcher.is_accepting()
+    matcher.feed("ccd")
+    assert matcher.is_accepting()
+
+    matcher.reset()
+    assert not matcher.is_accepting()
+    matcher.feed("ad")
+    assert matcher.is_accepting()
+
+
+@pytest.mark.parametrize("kind", ["nfa", "dfa"])
+def test_simulate_many_matches_simulate(kind):
+    automaton = build(kind, "(ab)*(a|ab)(b|ca)*")
+    words = ["abab", "", "a", "ab", "abca", "ababab", "abx", "ab", "b", "abcab"]
+
+    assert automaton.simulate_many(words) == [automaton.simulate(w) for w in words]
+
+
+@pytest.mark.parametrize("kind", ["nfa", "dfa"])
+def test_simulate_many_is_lazy_for_iterators(kind):
+    automaton = build(kind, "a(b|c)*")
+    words = iter(["abc", "ab", "x", "a", "acb"])
+
+    results = automaton.simulate_many(words)
+
+    assert not isinstance(results, list)
+    assert next(results)
+    assert list(results) == [True, False, True, True]
@@ -1,4 +1,5 @@
 import pytest
+from src import reduction
 from src.regex import RegularExpression
 from src.nfa import NFA
 
@@ -272,3 +273,97 @@ def test_nfa_with_complex_alternation():
     assert nfa.simulate("abcd")
     assert nfa.simulate("efgh")
     assert not nfa.simulate("abcdefg")
+
+
+def test_empty_alternative_matches_empty_word():
+    nfa = NFA.from_regex(RegularExpression("a(|b)c|"))
+
+    assert nfa.simulate("")
+    assert nfa.simulate("ac")
+    assert nfa.simulate("abc")
+    assert not nfa.simulate("a")
+
+
+@pytest.mark.parametrize(
+    "regex_str",
+    ["a", "a*b", "(ab)*(a|ab)(b|ca)*", "a(b|c)*d", "(a*b*)*|(c*d*)*", "a(|b)c", "∅"],
+)
+def test_glushkov_matches_thompson(regex_str):
+    regex = RegularExpression(regex_str)
+    thompson = NFA.from_regex(regex)
+    glushkov = NFA.from_regex(regex, method="glushkov")
+
+    words = ["", "a", "b", "ab", "ac", "abc", "abd", "abab", "ababca", "acbd", "cd"]
+    for word in words:
+        assert glushkov.simulate(word) == thompson.simulate(word), word
+
+
+def test_glushkov_has_one_state_per_position_and_no_epsilon():
+    nfa = NFA.from_regex(RegularExpression("(a|b)*abb"), method="glushkov")
+
+    assert len(nfa.states) == 6
+    assert "" not in nfa.alphabet
+    assert not nfa._has_epsilon_transitions()
+
+
+def test_unknown_construction_method():
+    with pytest.raises(ValueError):
+        NFA.from_regex(RegularExpression("a"), method="brzozowski")
+
+
+def test_thompson_size_is_linear_in_regex_length():
+    words = [f"a{i % 7}b{i % 5}" for i in range(5000)]
+    nfa = NFA.from_regex(RegularExpression("|".join(words)))
+
+    assert len(nfa.states) == 2 * 4 * len(words) + 2
+    assert nfa.states == list(range(len(nfa.states)))
+    assert len(nfa.accept_states) == 1
+    assert nfa.simulate("a3b1")
+    assert not nfa.simulate("a3b")
+
+
+@pytest.mark.parametrize(
+    "regex_str", ["(a|b)*abb(a|b)*", "(a|ab|abb)*(b|bb)*", "(ab)*(a|ab)(b|ca)*"]
+)
+def test_reduce_preserves_language(regex_str):
+    nfa = NFA.from_regex(RegularExpression(regex_str))
+    reduced = nfa.reduce()
+
+    assert len(reduced.states) < len(nfa.remove_epsilon_transitions().states)
+    assert not reduced._has_epsilon_transitions()
+    words = ["", "a", "b", "ab", "abb", "aabb", "abca", "babb", "abbab", "bbabba"]
+    for word in words:
+        assert reduced.simulate(word) == nfa.simulate(word), word
+
+
+def test_reduce_merges_bisimilar_states():
+    nfa = NFA.from_regex(
+        RegularExpression("|".join("a" * i + "b" for i in range(1, 20)))
+    )
+
+    assert len(nfa.reduce().states) == 21
+
+
+def test_reduce_refines_long_chain_in_linear_work(monkeypatch):
+    signatures = 0
+
+    def counting_frozenset(items):
+        nonlocal signatures
+        signatures += 1
+        return frozenset(items)
+
+    monkeypatch.setattr(reduction, "frozenset", counting_frozenset, raising=False)
+    length = 1000
+    nfa = NFA.from_regex(RegularExpression(f"[ab]{{{length}}}[ab]{{{length}}}"))
+    reduced = nfa.reduce()
+
+    assert len(reduced.states) == 2 * length + 1
+    assert signatures < 10 * len(nfa.states)
+
+
+def test_reduce_empty_language():
+    reduced = NFA.from_regex(RegularExpression("a∅")).reduce()
+
+    assert reduced.states == [reduced.start_state]
+    assert reduced.accept_states == []
+    assert not reduced.simulate("a")
@@ -0,0 +1,40 @@
+import pytest
+from src.dfa import DFA
+from src.regex import RegularExpression
+
+np = pytest.importorskip("numpy")
+
+
+def test_table_layout():
+    dfa = DFA.from_regex(RegularExpression("ab*")).minimize()
+    dense = dfa.to_numpy()
+
+    assert dense.table.dtype == np.int32
+    assert dense.table.shape == (len(dfa.states) + 1, 4)
+    assert (dense.table[dense.dead_state, :-1] == dense.dead_state).all()
+    assert (dense.table[:, dense.pad_symbol] == np.arange(len(dfa.states) + 1)).all()
+    assert not dense.accept[dense.dead_state]
+
+
+def test_batch_simulation_matches_simulate():
+    dfa = DFA.from_regex(RegularExpression("(ab)*(a|ab)(b|ca)*"))
+    dense = dfa.to_numpy()
+    words = ["", "a", "ab", "abab", "abca", "abx", "ba", "ababcab", "c", "abbb"]
+
+    results = dense.simulate_many(words)
+
+    assert results.dtype == bool
+    assert results.tolist() == [dfa.simulate(word) for word in words]
+    assert dense.simulate("abca")
+    assert not dense.simulate("abcx")
+
+
+def test_encode_pads_rows():
+    dense = DFA.from_regex(RegularExpression("a|bc")).to_numpy()
+
+    matrix = dense.encode(["bc", "a", "", "x"])
+
+    assert matrix.shape == (4, 2)
+    assert matrix[1, 1] == matrix[2, 0] == dense.pad_symbol
+    assert matrix[3, 0] == dense.unknown_symbol
+    assert dense.simulate_many([]).tolist() == []
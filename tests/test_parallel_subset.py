@@ -0,0 +1,27 @@
+from src.dfa import DFA
+from src.nfa import NFA
+from src.parallel_subset import parallel_subset_construction
+from src.regex import RegularExpression
+
+
+def test_parallel_matches_sequential_numbering():
+    nfa = NFA.from_regex(RegularExpression("(a|b)*a(a|b)(a|b)(a|b)(a|b)"))
+    expected = DFA.from_nfa(nfa, method="bitset")
+
+    for processes in (1, 2):
+        dfa = DFA.from_nfa(nfa, method="parallel", processes=processes)
+        assert dfa.states == expected.states
+        assert dfa.transitions == expected.transitions
+        assert dfa.accept_states == expected.accept_states
+
+
+def test_small_batches_are_merged_in_order():
+    nfa = NFA.from_regex(RegularExpression("(ab)*(a|ab)(b|ca)*|(a|b|c)*cc"))
+    expected = DFA.from_nfa(nfa, method="bitset")
+
+    transitions, accept_states = parallel_subset_construction(
+        nfa, processes=2, chunksize=2
+    )
+
+    assert dict(enumerate(transitions)) == expected.transitions
+    assert accept_states == expected.accept_states
@@ -0,0 +1,78 @@
+import itertools
+import pytest
+from src.dfa import DFA
+from src.nfa import NFA
+from src.product import ProductAutomaton
+from src.regex import RegularExpression
+
+WORDS = [
+    "".join(word)
+    for length in range(7)
+    for word in itertools.product("abc", repeat=length)
+]
+
+OPERATIONS = {
+    "intersection": lambda left, right: left and right,
+    "union": lambda left, right: left or right,
+    "difference": lambda left, right: left and not right,
+    "symmetric_difference": lambda left, right: left != right,
+}
+
+
+@pytest.mark.parametrize("operation", OPERATIONS)
+def test_operations_on_mixed_automata(operation):
+    left = NFA.from_regex(RegularExpression("(a|b)*abb(a|b)*"))
+    right = DFA.from_regex(RegularExpression("(ab)*(a|ab)(b|ba)*"))
+    product = getattr(left, operation)(right)
+    dfa = product.materialize()
+
+    expected = OPERATIONS[operation]
+    for word in WORDS:
+        result = expected(left.simulate(word), right.simulate(word))
+        assert product.simulate(word) == result, word
+        assert dfa.simulate(word) == result, word
+
+
+def test_states_are_created_lazily():
+    left = NFA.from_regex(RegularExpression("(a|b)*a(a|b)(a|b)(a|b)"))
+    right = NFA.from_regex(RegularExpression("(a|b)*b(a|b)(a|b)"))
+    product = left.intersection(right)
+
+    assert len(product.states) == 1
+    assert not product.simulate("ab")
+    assert len(product.states) == 3
+    assert product.simulate("abbb")
+    assert len(product.states) == 5
+
+
+def test_is_empty():
+    allow = NFA.from_regex(RegularExpression("a(a|b)*"))
+    deny = DFA.from_regex(RegularExpression("ab*"))
+
+    result = allow.difference(deny).is_empty()
+    assert not result
+    assert result.counterexample == "aa"
+    disjoint = allow.intersection(NFA.from_regex(RegularExpression("b(a|b)*")))
+    result = disjoint.is_empty()
+    assert result.holds
+    assert result.counterexample is None
+
+
+def test_nested_products():
+    patterns = [
+        NFA.from_regex(RegularExpression(f"(a|b)*{word}(a|b)*"))
+        for word in ["aaa", "bbb", "abab"]
+    ]
+    product = patterns[0].union(patterns[1]).union(patterns[2])
+    everything = DFA.from_regex(RegularExpression("(a|b)*"))
+
+    assert product.simulate("babbb")
+    assert not product.simulate("aabba")
+    assert not everything.difference(product).is_empty()
+    assert product.difference(everything).is_empty()
+
+
+def test_unknown_operation():
+    nfa = NFA.from_regex(RegularExpression("a"))
+    with pytest.raises(ValueError):
+        ProductAutomaton(nfa, nfa, "concatenation")
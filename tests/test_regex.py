@@ -1,5 +1,7 @@
 import pytest
 from src.regex import RegularExpression
+from src.nfa import NFA
+from src.regex_ast import EPSILON, MAX_REPEAT, Symbol, Union, parse, unparse
 
 
 @pytest.mark.parametrize(
@@ -74,3 +76,138 @@ def test_invalid_regex_postfix(input_regex):
     regex = RegularExpression(input_regex)
     with pytest.raises(ValueError):
         regex.to_postfix()
+
+
+@pytest.mark.parametrize(
+    "input_regex, expected_postfix",
+    [
+        ("a(bc)", "abc.."),
+        ("a|b|c", "ab|c|"),
+        ("(a*)*", "a**"),
+        ("a|", "a|"),
+        ("a()b", "a.b."),
+        ("∅", "∅"),
+    ],
+)
+def test_to_postfix_is_view_over_ast(input_regex, expected_postfix):
+    assert RegularExpression(input_regex).to_postfix() == expected_postfix
+
+
+def test_ast_shares_leaves_and_is_immutable():
+    ast = RegularExpression("ab|ba").to_ast()
+    assert isinstance(ast, Union)
+    first, second = ast.items
+    assert first.items[0] is second.items[1] is Symbol("a")
+    assert parse("(|a)").items[0] is EPSILON
+    with pytest.raises(AttributeError):
+        ast.items = ()
+
+
+def test_ast_structural_equality():
+    assert parse("a(b|c)*") == parse("a(b|c)*")
+    assert hash(parse("a(b|c)*")) == hash(parse("a(b|c)*"))
+    assert parse("a(b|c)*") != parse("a(b|d)*")
+
+
+def test_equal_deep_trees_are_shared():
+    regex_str = "a(b|" * 3000 + "c" + ")" * 3000
+    assert parse(regex_str) is parse(regex_str)
+    first, second = parse(f"({regex_str})|({regex_str})").items
+    assert first == second
+
+
+def test_parse_long_regex():
+    regex = RegularExpression("|".join(["ab", "cd"] * 20000))
+    assert len(regex.to_ast().items) == 40000
+    assert regex.to_postfix().startswith("ab.cd.|ab.|")
+
+
+@pytest.mark.parametrize(
+    "input_regex, expected_postfix",
+    [
+        ("a?", "a?"),
+        ("a{2,3}b", "a{2,3}b."),
+        ("(ab){1,}", "ab.{1,}"),
+        ("[a-dx]{3}", "[a-dx]{3}"),
+    ],
+)
+def test_quantifiers_and_classes_postfix(input_regex, expected_postfix):
+    assert RegularExpression(input_regex).to_postfix() == expected_postfix
+
+
+@pytest.mark.parametrize(
+    "input_regex", ["a{}", "a{x}", "a{3,2}", "a{2", "[]", "[^a]", "a]", "?a", "a*?"]
+)
+def test_invalid_quantifiers_and_classes(input_regex):
+    with pytest.raises(ValueError):
+        RegularExpression(input_regex).to_ast()
+
+
+@pytest.mark.parametrize(
+    "regex_str, accepted, rejected",
+    [
+        ("ab?c", ["ac", "abc"], ["abbc", "a"]),
+        ("a{2,3}", ["aa", "aaa"], ["", "a", "aaaa"]),
+        ("a{2}", ["aa"], ["a", "aaa"]),
+        ("(ab){1,}", ["ab", "abab"], ["", "a", "aba"]),
+        ("a{,2}b", ["b", "ab", "aab"], ["aaab"]),
+        ("[a-c]x[0-9]{2}", ["ax10", "cx99"], ["dx10", "ax1", "ax100"]),
+        ("(a?){3}", ["", "a", "aaa"], ["aaaa", "b"]),
+    ],
+)
+def test_quantifiers_and_classes_match(regex_str, accepted, rejected):
+    regex = RegularExpression(regex_str)
+    nfa = NFA.from_regex(regex)
+    glushkov = NFA.from_regex(regex, method="glushkov")
+
+    for word in accepted:
+        assert regex.simulate(word) and nfa.simulate(word) and glushkov.simulate(word)
+    for word in rejected:
+        assert not regex.simulate(word)
+        assert not nfa.simulate(word)
+        assert not glushkov.simulate(word)
+
+
+def test_repetition_count_is_bounded():
+    RegularExpression(f"a{{{MAX_REPEAT}}}").to_ast()
+    for regex_str in [
+        f"a{{{MAX_REPEAT + 1}}}",
+        f"a{{2,{MAX_REPEAT + 1}}}",
+        "a{99999999999999999999}",
+    ]:
+        with pytest.raises(ValueError, match="exceeds"):
+            RegularExpression(regex_str).to_ast()
+
+
+@pytest.mark.parametrize("method", ["thompson", "glushkov"])
+def test_nested_repetition_size_is_bounded(method):
+    for regex_str in ["((a{1000}){1000}){1000}", "(a{500}b){500}"]:
+        with pytest.raises(ValueError, match="expand to more than"):
+            NFA.from_regex(RegularExpression(regex_str), method=method)
+    assert NFA.from_regex(RegularExpression("(a{10}){10}"), method=method).simulate(
+        "a" * 100
+    )
+
+
+def test_counted_repetition_grows_linearly():
+    small = NFA.from_regex(RegularExpression("[a-z]{1,10}"), method="glushkov")
+    large = NFA.from_regex(RegularExpression("[a-z]{1,100}"), method="glushkov")
+
+    assert len(small.states) == 11
+    assert len(large.states) == 101
+    assert large.simulate("z" * 100)
+    assert not large.simulate("z" * 101)
+
+
+def test_unparse_round_trip_with_quantifiers():
+    for regex_str in ["a?b{2,}", "(ab){1,3}", "[a-ex]*", "[ab]|c{,4}"]:
+        ast = parse(regex_str)
+        assert parse(unparse(ast)) == ast
+
+
+@pytest.mark.parametrize(
+    "regex_str",
+    ["(a?)*", "(a{2})*", "(a*)?", "((ab)?){2,3}", "(a{1,}){,2}b", "((a|b)*)?c"],
+)
+def test_unparse_round_trip_with_nested_quantifiers(regex_str):
+    assert parse(unparse(parse(regex_str))) is parse(regex_str)
@@ -0,0 +1,94 @@
+import pytest
+from src import simplify as simplify_module
+from src.dfa import DFA
+from src.nfa import NFA
+from src.regex import RegularExpression
+from src.regex_ast import parse, unparse
+from src.simplify import simplify
+
+
+@pytest.mark.parametrize(
+    "input_regex, expected_regex",
+    [
+        ("a()b", "ab"),
+        ("a∅|b", "b"),
+        ("((a*)*)*", "a*"),
+        ("()*", ""),
+        ("(|a)*", "a*"),
+        ("(a*|b)*", "(a|b)*"),
+        ("(a*b*)*", "(a|b)*"),
+        ("a*a*", "a*"),
+        ("|aa*", "a*"),
+        ("b|a|b", "a|b"),
+        ("ab|ac|a", "a(|b|c)"),
+        ("abc|abd", "ab(c|d)"),
+        ("∅", "∅"),
+        ("(a*){2,3}", "a*"),
+        ("a{1}b{0,}", "ab*"),
+        ("(a?)?", "a?"),
+        ("∅{2}|b{0}", ""),
+    ],
+)
+def test_simplify_rules(input_regex, expected_regex):
+    assert unparse(simplify(parse(input_regex))) == expected_regex
+
+
+@pytest.mark.parametrize(
+    "regex_str", ["a(b|c)*", "(a|b)*c(d|e)|f", "(ab)*(a|ab)(b|ca)*", "a*|b*"]
+)
+def test_to_regex_round_trip_stays_small(regex_str):
+    nfa = NFA.from_regex(RegularExpression(regex_str))
+    dfa = DFA.from_nfa(nfa).minimize()
+    regex = dfa.to_regex()
+
+    assert len(regex.get_regex()) <= 4 * len(regex_str)
+    words = ["", "a", "ab", "ac", "abc", "abab", "ababca", "cd", "bce", "f", "bb"]
+    for word in words:
+        assert regex.simulate(word) == nfa.simulate(word), word
+
+
+@pytest.mark.parametrize(
+    "regex_str",
+    ["(a?)*", "(a{2})*", "(a*)?", "((ab)?){2,3}", "(a{2}|b)?c", "((a?){2})*b"],
+)
+def test_simplified_nested_quantifiers_parse_again(regex_str):
+    original = RegularExpression(regex_str)
+    words = ["", "a", "aa", "aaa", "b", "ab", "abab", "ababab", "aab", "c", "aac", "bc"]
+    for simplified in (original.simplify(), original.fix()):
+        ast = parse(simplified.get_regex())
+        assert ast is simplified.to_ast()
+        for word in words:
+            assert simplified.simulate(word) == original.simulate(word), word
+
+
+def test_fix_returns_simplified_regex():
+    regex = RegularExpression("(|a)(b|b)()").fix()
+
+    assert isinstance(regex, RegularExpression)
+    assert regex.get_regex() == "(|a)b"
+
+
+def test_to_regex_with_long_common_prefix():
+    nfa = NFA.from_regex(RegularExpression("a" * 1000 + "b|" + "a" * 1000 + "c"))
+    regex = nfa.to_regex()
+
+    assert regex.get_regex() == "a" * 1000 + "(b|c)"
+    assert regex.simulate("a" * 1000 + "c")
+    assert not regex.simulate("a" * 999 + "c")
+
+
+def test_nested_alternations_simplify_in_linear_work(monkeypatch):
+    rendered = 0
+
+    def counting_unparse(node):
+        nonlocal rendered
+        text = unparse(node)
+        rendered += len(text)
+        return text
+
+    monkeypatch.setattr(simplify_module, "unparse", counting_unparse)
+    regex_str = "a(b|" * 4000 + "c" + ")" * 4000
+    simplified = RegularExpression(regex_str).simplify()
+
+    assert len(simplified.get_regex()) == len(regex_str)
+    assert rendered < 2 * len(regex_str)
@@ -0,0 +1,60 @@
+import itertools
+import random
+import pytest
+from src.dfa import DFA
+from src.nfa import NFA
+from src.regex import RegularExpression
+
+STRATEGIES = ["order", "degree", "weight", "dynamic"]
+
+
+def random_dfa(num_states, seed):
+    rng = random.Random(seed)
+    dfa = DFA()
+    dfa.states = list(range(num_states))
+    dfa.alphabet = {"a", "b"}
+    dfa.start_state = 0
+    dfa.accept_states = rng.sample(dfa.states, 3)
+    dfa.transitions = {
+        state: {symbol: rng.randrange(num_states) for symbol in "ab"}
+        for state in dfa.states
+    }
+    return dfa
+
+
+def words(max_length):
+    for length in range(max_length + 1):
+        yield from map("".join, itertools.product("ab", repeat=length))
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_strategies_preserve_language(strategy):
+    nfa = NFA.from_regex(RegularExpression("(ab)*(a|ab)(b|ba)*"))
+    dfa = random_dfa(12, seed=3)
+
+    nfa_regex = nfa.to_regex(strategy)
+    dfa_regex = dfa.to_regex(strategy)
+
+    for word in words(6):
+        assert nfa_regex.simulate(word) == nfa.simulate(word), word
+        assert dfa_regex.simulate(word) == dfa.simulate(word), word
+
+
+def test_dynamic_order_gives_smaller_regex():
+    dfa = random_dfa(20, seed=5)
+
+    order_size = len(dfa.to_regex("order").get_regex())
+    dynamic_size = len(dfa.to_regex("dynamic").get_regex())
+
+    assert dynamic_size * 10 < order_size
+
+
+def test_empty_language():
+    dfa = DFA.from_regex(RegularExpression("∅"))
+
+    assert dfa.to_regex("dynamic").get_regex() == "∅"
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        NFA.from_regex(RegularExpression("a")).to_regex("random")